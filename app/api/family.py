@@ -6,9 +6,11 @@ from fastapi import (
     Depends,
     HTTPException,
     Query,
+    Request,
     Response,
     status,
 )
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.auth import get_current_active_user
@@ -16,47 +18,100 @@ from app.models.admin_user import AdminUser
 from app.schemas.family import (
     FamilyMemberCreate,
     FamilyMemberRead,
+    FamilyMemberSearchResult,
+    FamilyMemberSuggestion,
     FamilyMemberUpdate,
     MemberListDelete,
     PaginatedFamilyMembersResponse,
     RelationCreate,
     RelationRead,
 )
-from app.services import family_service
+from app.services import family_service, name_index, search_service, tree_cache
 from app.services.family_service import (
+    InvalidCursorError,
     InvalidRelationError,
     MemberNotFoundError,
     RelationNotFoundError,
 )
-from app.utils.database import get_db_session
+from app.utils.database import AsyncSessionFactory, get_db_session
+from app.utils.http_cache import build_cached_response
 from app.utils.localization import get_text
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+async def _stream_family_tree_ndjson():
+    """
+    Streams all members as newline-delimited JSON.
+
+    The generator owns its session because request-scoped dependencies are
+    closed before a streaming response body is sent.
+    """
+    async with AsyncSessionFactory() as session:
+        count = 0
+        async for member in family_service.iter_family_members(session):
+            yield member.model_dump_json().encode() + b"\n"
+            count += 1
+        logger.info(f"Streamed {count} family members as NDJSON.")
+
+
 @router.get(
     "/family/tree",
     response_model=list[FamilyMemberRead],
     summary="Get Complete Family Tree",
-    description="Retrieves all family members and their relationships.",
+    description="Retrieves all family members and their relationships. Supports ETag revalidation (If-None-Match) and gzip/brotli encoding. Send 'Accept: application/x-ndjson' to stream one member per line instead (without 'is_descendant', so 'root' is not accepted).",
     tags=["Family"],
 )
 async def get_family_tree(
-    db: AsyncSession = Depends(get_db_session),
+    request: Request,
+    root: str | None = Query(
+        None,
+        description="Member ID to compute the 'is_descendant' flag from. Defaults to the configured tree roots.",
+    ),
 ):
     """
     API endpoint to retrieve the entire family tree data.
+    The body is served pre-serialized from the tree snapshot; a matching
+    If-None-Match header yields 304 Not Modified.
+
+    No request-scoped session is used: the NDJSON stream opens its own, and
+    the snapshot path needs one only while the snapshot is checked or rebuilt.
     """
-    logger.info("Received request for /family/tree endpoint.")
+    logger.info(f"Received request for /family/tree endpoint (root={root}).")
+    if NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        if root is not None:
+            # The stream leaves 'is_descendant' unset; it needs the whole graph.
+            logger.warning("Rejected 'root' for an NDJSON family tree request.")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=get_text("error_root_not_supported_ndjson"),
+            )
+        logger.info("Streaming family tree as NDJSON.")
+        return StreamingResponse(
+            _stream_family_tree_ndjson(), media_type=NDJSON_MEDIA_TYPE
+        )
     try:
-        logger.info("Attempting to call family_service.get_all_family_members...")
-        family_members_orm = await family_service.get_all_family_members(db)
+        async with AsyncSessionFactory() as db:
+            snapshot = await tree_cache.get_family_tree_snapshot(db)
+        encoded = snapshot.encoded
+        if root is not None:
+            encoded = tree_cache.get_encoded_tree_for_root(snapshot, root)
+            if encoded is None:
+                logger.warning(f"Requested family tree root '{root}' not found.")
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=get_text("error_member_not_found"),
+                )
         logger.info(
-            f"Successfully retrieved {len(family_members_orm)} members from service."
+            f"Returning {len(snapshot.members)} members from tree snapshot (version {snapshot.version})."
         )
-        logger.info("Returning family members data.")
-        return family_members_orm
+        return build_cached_response(request, encoded)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(
             f"Error type: {type(e).__name__}, Error details: {e}", exc_info=True
@@ -68,6 +123,73 @@ async def get_family_tree(
         )
 
 
+@router.get(
+    "/family/search",
+    response_model=list[FamilyMemberSearchResult],
+    summary="Search Family Members",
+    description="Full-text search over names, location and notes, ranked by relevance.",
+    tags=["Family"],
+)
+async def search_family_members(
+    q: str = Query(..., min_length=1, max_length=200, description="Search text"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of results"),
+    db: AsyncSession = Depends(get_db_session),
+):
+    """
+    API endpoint to search family members by name, location or notes.
+    """
+    logger.info(f"Received request for /family/search endpoint with q='{q}'.")
+    try:
+        return await search_service.search_family_members(db, q, limit=limit)
+    except Exception:
+        logger.exception(f"An unexpected error occurred while searching for '{q}'.")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=get_text("error_occurred"),
+        )
+
+
+@router.get(
+    "/family/tree/{member_id}",
+    response_model=list[FamilyMemberRead],
+    summary="Get Family Tree Window Around a Member",
+    description="Retrieves a member with N generations of ancestors and M generations of descendants (plus spouses), for incremental tree loading.",
+    tags=["Family"],
+)
+async def get_family_tree_window(
+    member_id: str,
+    up: int = Query(2, ge=0, le=20, description="Generations of ancestors"),
+    down: int = Query(2, ge=0, le=20, description="Generations of descendants"),
+    db: AsyncSession = Depends(get_db_session),
+):
+    """
+    API endpoint to retrieve part of the family tree around a focus member.
+    """
+    logger.info(
+        f"Received request for /family/tree/{member_id} endpoint (up={up}, down={down})."
+    )
+    try:
+        snapshot = await tree_cache.get_family_tree_snapshot(db)
+        body = tree_cache.get_tree_window(snapshot, member_id, up=up, down=down)
+        if body is None:
+            logger.warning(f"Tree window requested for unknown member '{member_id}'.")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=get_text("error_member_not_found"),
+            )
+        return Response(content=body, media_type="application/json")
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception(
+            f"An unexpected error occurred while fetching the tree window for '{member_id}'."
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=get_text("error_occurred"),
+        )
+
+
 @router.get(
     "/family/members/list",
     response_model=PaginatedFamilyMembersResponse,
@@ -79,32 +201,56 @@ async def list_family_members(
     page: int = Query(1, ge=1, description="Page number (1-based)"),
     size: int = Query(10, ge=1, le=100, description="Items per page"),
     search: str | None = Query(None, description="Search term to filter by name"),
+    cursor: str | None = Query(
+        None,
+        description="Opaque cursor from a previous response's next_cursor. Takes precedence over page.",
+    ),
+    include_total: bool = Query(
+        True, description="Whether to count all matching members"
+    ),
     db: AsyncSession = Depends(get_db_session),
     current_user: AdminUser = Depends(get_current_active_user),
 ):
     """
     Admin endpoint to get a paginated list of family members, with optional search.
+    Supports both page numbers and keyset cursors (next_cursor).
     """
     logger.info(
-        f"Admin '{current_user.username}' listing members: page={page}, size={size}, search='{search}'"
+        f"Admin '{current_user.username}' listing members: page={page}, size={size}, search='{search}', cursor={cursor}"
     )
     skip = (page - 1) * size
     limit = size
     try:
-        members_list, total_items = await family_service.get_paginated_family_members(
+        (
+            members_list,
+            total_items,
+            next_cursor,
+        ) = await family_service.get_paginated_family_members(
             db=db,
             skip=skip,
             limit=limit,
             search_term=search,
+            cursor=cursor,
+            include_total=include_total,
         )
-        total_pages = math.ceil(total_items / size) if size > 0 else 0
+        total_pages = math.ceil(total_items / size) if total_items is not None else None
 
         return PaginatedFamilyMembersResponse(
             total_items=total_items,
             items=members_list,
-            page=page,
+            # A cursor page's number is not known without counting the rows before it.
+            page=None if cursor else page,
             size=size,
             total_pages=total_pages,
+            next_cursor=next_cursor,
+        )
+    except InvalidCursorError as e:
+        logger.warning(
+            f"Invalid pagination cursor from admin '{current_user.username}': {cursor}"
+        )
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
         )
     except Exception as e:
         logger.exception(
@@ -117,6 +263,33 @@ async def list_family_members(
         )
 
 
+@router.get(
+    "/family/members/suggest",
+    response_model=list[FamilyMemberSuggestion],
+    summary="Suggest Family Members by Name (Admin)",
+    description="Typeahead suggestions for members whose first or last name starts with the given text. Served from an in-memory index. Requires admin authentication.",
+    tags=["Family Admin"],
+)
+async def suggest_family_members(
+    q: str = Query(..., min_length=1, max_length=100, description="Typed text"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of suggestions"),
+    db: AsyncSession = Depends(get_db_session),
+    current_user: AdminUser = Depends(get_current_active_user),
+):
+    """
+    Admin endpoint returning name suggestions as the user types.
+    """
+    logger.debug(f"Admin '{current_user.username}' requested suggestions for '{q}'.")
+    try:
+        return await name_index.suggest_family_members(db, q, limit=limit)
+    except Exception:
+        logger.exception(f"An unexpected error occurred while suggesting for '{q}'.")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=get_text("error_occurred"),
+        )
+
+
 @router.post(
     "/family/members",
     response_model=FamilyMemberRead,
@@ -1,6 +1,9 @@
+import html
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import HTMLResponse
+from pydantic import EmailStr
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.schemas.subscription import (
@@ -11,6 +14,7 @@ from app.schemas.subscription import (
 from app.services import subscription_service
 from app.services.subscription_service import (
     EmailAlreadyExistsError,
+    SubscriptionNotFoundError,
 )
 from app.utils.database import get_db_session
 from app.utils.localization import get_text
@@ -64,3 +68,100 @@ async def subscribe_email(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=get_text("error_occurred"),
         )
+
+
+def _check_unsubscribe_token(email: str, token: str) -> None:
+    """Raises an HTTPException unless `token` authorizes unsubscribing `email`."""
+    try:
+        valid = subscription_service.verify_unsubscribe_token(email, token)
+    except Exception:
+        logger.exception("Could not verify unsubscribe token.", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=get_text("error_occurred"),
+        )
+    if not valid:
+        logger.warning(f"Invalid unsubscribe token for {email}")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=get_text("unsubscribe_link_invalid"),
+        )
+
+
+@router.get(
+    "/unsubscribe",
+    response_class=HTMLResponse,
+    summary="Confirm Unsubscribing Email from Notifications",
+    description=(
+        "Opened from the link in every notification. Only checks the link and "
+        "shows a confirmation form that POSTs back, so link scanners and "
+        "prefetchers cannot unsubscribe anyone."
+    ),
+    tags=["Subscriptions"],
+)
+async def confirm_unsubscribe_email(
+    request: Request,
+    email: EmailStr = Query(..., description="The subscribed email address."),
+    token: str = Query(..., description="The token from the unsubscribe link."),
+):
+    """
+    API endpoint showing the unsubscribe confirmation for an unsubscribe link.
+    """
+    logger.info(f"Received request for GET /unsubscribe with email: {email}")
+    _check_unsubscribe_token(email, token)
+    # Relative, so the form posts back to this URL even behind a proxy prefix.
+    action = html.escape(f"?{request.url.query}")
+    return HTMLResponse(
+        "<!DOCTYPE html>\n"
+        '<html lang="ru"><head><meta charset="utf-8">'
+        f"<title>{html.escape(get_text('unsubscribe_confirm_title'))}</title></head>"
+        "<body>"
+        f"<p>{html.escape(get_text('unsubscribe_confirm_prompt', email=email))}</p>"
+        f'<form method="post" action="{action}">'
+        f'<button type="submit">{html.escape(get_text("unsubscribe_confirm_button"))}'
+        "</button></form></body></html>"
+    )
+
+
+@router.post(
+    "/unsubscribe",
+    response_model=SubscriptionResponse,
+    summary="Unsubscribe Email from Notifications",
+    description=(
+        "Unsubscribes an email address using the signed link included in every "
+        "notification. Serves the confirmation form and RFC 8058 one-click "
+        "unsubscribe from mail clients."
+    ),
+    tags=["Subscriptions"],
+)
+async def unsubscribe_email(
+    email: EmailStr = Query(..., description="The subscribed email address."),
+    token: str = Query(..., description="The token from the unsubscribe link."),
+    db: AsyncSession = Depends(get_db_session),
+):
+    """
+    API endpoint to unsubscribe an email address from an unsubscribe link.
+    """
+    logger.info(f"Received request for POST /unsubscribe with email: {email}")
+    _check_unsubscribe_token(email, token)
+
+    try:
+        subscription_orm = await subscription_service.remove_subscription(db, email)
+        return SubscriptionResponse(
+            message=get_text("unsubscribed_successfully"),
+            subscription=SubscriptionRead.model_validate(subscription_orm),
+        )
+    except SubscriptionNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=get_text("subscription_not_found"),
+        )
+    except Exception:
+        logger.exception(
+            f"An unexpected error occurred during unsubscription for {email}.",
+            exc_info=True,
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=get_text("error_occurred"),
+        )
@@ -3,6 +3,7 @@
 
 from .admin_user import AdminUser
 from .family_member import FamilyMember
+from .ingest_state import IngestState
 from .relation import Relation
 from .subscribed_email import SubscribedEmail
 
@@ -12,4 +13,5 @@ __all__ = [
     "Relation",
     "SubscribedEmail",
     "AdminUser",
+    "IngestState",
 ]
@@ -0,0 +1,21 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.utils.database import Base
+
+
+class IngestState(Base):
+    """Bookkeeping for an external data source (e.g. the Google Sheet)."""
+
+    __tablename__ = "ingest_state"
+
+    source: Mapped[str] = mapped_column(String(100), primary_key=True)
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    applied_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+    def __repr__(self):
+        return f"<IngestState {self.source} {self.content_hash[:12]}>"
@@ -12,7 +12,10 @@ async def ingest_data_job():
     logger.info("Running scheduled data ingestion job.")
     try:
         async with AsyncSessionFactory() as session:
-            await process_family_data(session)
+            report = await process_family_data(session)
+        if report is not None and not report.is_valid:
+            logger.error("Scheduled data ingestion job rejected invalid data.")
+            return
         logger.info("Scheduled data ingestion job finished successfully.")
     except Exception as e:
         logger.error(f"Scheduled data ingestion job failed: {e}", exc_info=True)
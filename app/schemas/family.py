@@ -11,11 +11,21 @@ T = TypeVar("T")
 class PaginatedResponse(BaseModel, Generic[T]):
     """Generic schema for paginated API responses."""
 
-    total_items: int = Field(..., description="Total number of items available.")
+    total_items: int | None = Field(
+        ..., description="Total number of items available (None if not counted)."
+    )
     items: list[T] = Field(..., description="List of items for the current page.")
-    page: int = Field(..., description="Current page number (1-based).")
+    page: int | None = Field(
+        ...,
+        description="Current page number (1-based); None when requested by cursor.",
+    )
     size: int = Field(..., description="Number of items per page.")
-    total_pages: int = Field(..., description="Total number of pages.")
+    total_pages: int | None = Field(
+        ..., description="Total number of pages (None if not counted)."
+    )
+    next_cursor: str | None = Field(
+        None, description="Opaque cursor for the next page, None on the last page."
+    )
 
 
 class RelationBase(BaseModel):
@@ -87,6 +97,21 @@ class FamilyMemberReadMinimal(FamilyMemberBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class FamilyMemberSearchResult(FamilyMemberReadMinimal):
+    """Schema for a family member returned by full-text search."""
+
+    name: str
+    score: float = Field(..., description="Relevance score, higher is better.")
+
+
+class FamilyMemberSuggestion(BaseModel):
+    """Schema for a typeahead suggestion: just enough to pick the right member."""
+
+    id: str
+    name: str
+    birth_date: date | None = None
+
+
 class FamilyMemberRead(FamilyMemberBase):
     """Full schema for reading a single family member, including relationships."""
 
@@ -0,0 +1,154 @@
+"""
+In-memory day-of-year index over the birthdays of living members.
+
+Each member is keyed by the day of year of their birthday in a leap year
+(1-366), so 29 February has a key of its own and every other date has the
+same key in every year. Entries are kept sorted by key, which turns "all
+birthdays between two dates" into one or two slices found by binary search
+(two when the window wraps around the end of the year), already in date
+order. In other years 29 February birthdays are celebrated on 28 February.
+
+The index is rebuilt from the database when the graph version changes.
+"""
+
+import asyncio
+import bisect
+import calendar
+import logging
+from collections.abc import Iterable, Iterator
+from datetime import date
+from typing import NamedTuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import FamilyMember
+from app.services.graph_version import get_graph_version, sync_graph_version
+
+logger = logging.getLogger(__name__)
+
+# Day of year before the first of each month, in a leap year.
+_LEAP_MONTH_STARTS = (0, 31, 60, 91, 121, 152, 182, 213, 244, 274, 305, 335)
+FEBRUARY_29_KEY = 60
+
+
+def birthday_key(month: int, day: int) -> int:
+    """Returns the leap-year day of year (1-366) of a month and day."""
+    return _LEAP_MONTH_STARTS[month - 1] + day
+
+
+def birthday_in_year(birth_date: date, year: int) -> date:
+    """Returns the date the birthday falls on in `year` (29 Feb -> 28 Feb)."""
+    if birth_date.month == 2 and birth_date.day == 29 and not calendar.isleap(year):
+        return date(year, 2, 28)
+    return birth_date.replace(year=year)
+
+
+class BirthdayEntry(NamedTuple):
+    key: int
+    member_id: str
+    name: str
+    birth_date: date
+
+
+class BirthdayIndex:
+    """Living members with a birth date, sorted by birthday key."""
+
+    __slots__ = ("version", "_keys", "_entries")
+
+    def __init__(self):
+        # Graph version the index reflects; -1 until the first build.
+        self.version = -1
+        self._keys: list[int] = []
+        self._entries: list[BirthdayEntry] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def rebuild(
+        self,
+        members: Iterable[tuple[str, str, str | None, date]],
+        version: int,
+    ) -> None:
+        """
+        Replaces the whole index.
+
+        Args:
+            members: `(id, first_name, last_name, birth_date)` tuples of living
+                members with a birth date.
+            version: The graph version the members were loaded at.
+        """
+        entries = sorted(
+            BirthdayEntry(
+                birthday_key(birth_date.month, birth_date.day),
+                member_id,
+                f"{first_name} {last_name}" if last_name else first_name,
+                birth_date,
+            )
+            for member_id, first_name, last_name, birth_date in members
+        )
+        self._entries = entries
+        self._keys = [entry.key for entry in entries]
+        self.version = version
+
+    def _between(self, low: int, high: int) -> list[BirthdayEntry]:
+        """Returns the entries with `low <= key <= high`, in key order."""
+        start = bisect.bisect_left(self._keys, low)
+        end = bisect.bisect_right(self._keys, high)
+        return self._entries[start:end]
+
+    def upcoming(self, start: date, end: date) -> Iterator[tuple[date, BirthdayEntry]]:
+        """
+        Yields `(birthday, entry)` for every birthday from `start` to `end`
+        (inclusive) in date order, listing each member at most once.
+        """
+        seen = set()
+        for year in range(start.year, end.year + 1):
+            first_day = start if year == start.year else date(year, 1, 1)
+            last_day = end if year == end.year else date(year, 12, 31)
+            low = birthday_key(first_day.month, first_day.day)
+            high = birthday_key(last_day.month, last_day.day)
+            if high == FEBRUARY_29_KEY - 1 and not calendar.isleap(year):
+                high = FEBRUARY_29_KEY  # Celebrated on 28 February this year.
+            for entry in self._between(low, high):
+                if entry.member_id not in seen:
+                    seen.add(entry.member_id)
+                    yield birthday_in_year(entry.birth_date, year), entry
+
+
+_index = BirthdayIndex()
+_build_lock = asyncio.Lock()
+
+
+async def get_birthday_index(db: AsyncSession) -> BirthdayIndex:
+    """
+    Returns the birthday index, rebuilding it if it is behind the graph version.
+
+    Args:
+        db: The asynchronous database session (used only to build the index
+            and for the periodic check for writes by other processes).
+
+    Returns:
+        The current BirthdayIndex.
+    """
+    if _index.version == await sync_graph_version(db):
+        return _index
+
+    async with _build_lock:
+        if _index.version == get_graph_version():
+            return _index
+        version = await sync_graph_version(db)
+        logger.info(f"Building birthday index for graph version {version}.")
+        stmt = select(
+            FamilyMember.id,
+            FamilyMember.first_name,
+            FamilyMember.last_name,
+            FamilyMember.birth_date,
+        ).where(
+            FamilyMember.birth_date.isnot(None),
+            FamilyMember.death_date.is_(None),
+        )
+        rows = (await db.execute(stmt)).all()
+        _index.rebuild(rows, version)
+        logger.info(f"Birthday index built with {len(_index)} members.")
+    return _index
@@ -1,4 +1,6 @@
+import bisect
 import logging
+from dataclasses import dataclass
 from datetime import date, timedelta
 
 from sqlalchemy import extract, select
@@ -6,25 +8,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import FamilyMember, SubscribedEmail
 from app.schemas.birthday import BirthdayNotificationInfo, UpcomingBirthdayRead
+from app.services.birthday_index import BirthdayIndex, get_birthday_index
 
 logger = logging.getLogger(__name__)
 
 
-def calculate_next_birthday(birth_date: date, today: date) -> date:
-    """Calculates the date of the next birthday."""
-    try:
-        next_bday = birth_date.replace(year=today.year)
-    except ValueError:
-        next_bday = birth_date.replace(year=today.year, day=28)
-
-    if next_bday < today:
-        try:
-            next_bday = birth_date.replace(year=today.year + 1)
-        except ValueError:
-            next_bday = birth_date.replace(year=today.year + 1, day=28)
-    return next_bday
-
-
 def calculate_age(birth_date: date, on_date: date) -> int:
     """Calculates age on a specific date."""
     age = (
@@ -35,52 +23,108 @@ def calculate_age(birth_date: date, on_date: date) -> int:
     return age
 
 
+# Days covered by the materialized calendar; the API allows windows of 1-365.
+CALENDAR_DAYS = 365
+
+
+@dataclass
+class BirthdayCalendar:
+    """
+    Birthdays of the CALENDAR_DAYS days starting at `day`, sorted by date,
+    as of graph version `version`.
+    """
+
+    day: date
+    version: int
+    birthdays: list[UpcomingBirthdayRead]
+    days_until: list[int]
+
+    def window(self, days: int) -> list[UpcomingBirthdayRead]:
+        """Returns the birthdays of the first `days` days after `day` (inclusive)."""
+        return self.birthdays[: bisect.bisect_right(self.days_until, days)]
+
+
+_calendar: BirthdayCalendar | None = None
+
+
+def _upcoming_from_index(
+    index: BirthdayIndex, today: date, days: int
+) -> list[UpcomingBirthdayRead]:
+    return [
+        UpcomingBirthdayRead(
+            member_id=entry.member_id,
+            name=entry.name,
+            birth_date=entry.birth_date,
+            next_birthday_date=next_birthday,
+            days_until_birthday=(next_birthday - today).days,
+            upcoming_age=next_birthday.year - entry.birth_date.year,
+        )
+        for next_birthday, entry in index.upcoming(today, today + timedelta(days=days))
+    ]
+
+
+async def get_birthday_calendar(db: AsyncSession) -> BirthdayCalendar:
+    """
+    Returns the birthday calendar for today, materializing it on the first
+    call of the day and after any change to the members.
+
+    Args:
+        db: The asynchronous database session (used only to rebuild the
+            birthday index and for the periodic check for external writes).
+
+    Returns:
+        The current BirthdayCalendar.
+    """
+    global _calendar
+
+    index = await get_birthday_index(db)
+    today = date.today()
+    calendar = _calendar
+    if (
+        calendar is not None
+        and calendar.day == today
+        and calendar.version == index.version
+    ):
+        return calendar
+
+    logger.info(
+        f"Materializing birthday calendar for {today} (version {index.version})."
+    )
+    birthdays = _upcoming_from_index(index, today, CALENDAR_DAYS)
+    _calendar = BirthdayCalendar(
+        day=today,
+        version=index.version,
+        birthdays=birthdays,
+        days_until=[birthday.days_until_birthday for birthday in birthdays],
+    )
+    return _calendar
+
+
 async def get_upcoming_birthdays(
     db: AsyncSession, days: int = 90
 ) -> list[UpcomingBirthdayRead]:
     """
     Fetches family members with birthdays in the upcoming specified number of days.
 
+    Windows of up to CALENDAR_DAYS days are sliced from the materialized
+    calendar, so repeated requests cost only the copy of the result.
+
     Args:
         db: The asynchronous database session.
-        days: The number of days ahead to check for birthdays (default: 30).
+        days: The number of days ahead to check for birthdays (default: 90).
 
     Returns:
         A list of UpcomingBirthdayRead objects, sorted by the next birthday date.
     """
     logger.info(f"Fetching upcoming birthdays within the next {days} days.")
-    today = date.today()
-    end_date = today + timedelta(days=days)
 
     try:
-        stmt = select(FamilyMember).where(
-            FamilyMember.birth_date.isnot(None),
-            FamilyMember.death_date.is_(None),
-        )
-        result = await db.execute(stmt)
-        members = result.scalars().all()
-
-        upcoming = []
-        for member in members:
-            if member.birth_date:
-                next_birthday = calculate_next_birthday(member.birth_date, today)
-
-                if today <= next_birthday <= end_date:
-                    days_until = (next_birthday - today).days
-                    upcoming_age = calculate_age(member.birth_date, next_birthday)
-
-                    upcoming.append(
-                        UpcomingBirthdayRead(
-                            member_id=member.id,
-                            name=member.name,
-                            birth_date=member.birth_date,
-                            next_birthday_date=next_birthday,
-                            days_until_birthday=days_until,
-                            upcoming_age=upcoming_age,
-                        )
-                    )
-
-        upcoming.sort(key=lambda x: x.next_birthday_date)
+        if days <= CALENDAR_DAYS:
+            calendar = await get_birthday_calendar(db)
+            upcoming = calendar.window(days)
+        else:
+            index = await get_birthday_index(db)
+            upcoming = _upcoming_from_index(index, date.today(), days)
 
         logger.info(f"Found {len(upcoming)} upcoming birthdays.")
         return upcoming
@@ -0,0 +1,262 @@
+"""
+Asynchronous delivery queue for notification emails.
+
+Messages are queued and delivered by a fixed number of workers, each with a
+persistent SmtpSender of its own, so no more than MAIL_CONCURRENCY SMTP
+sessions are open at once. smtplib is blocking, so the SMTP calls run in a
+thread pool with one thread per worker and the event loop stays free while
+mail drains. A delivery that fails transiently (lost connection, 4xx reply)
+is retried with exponential backoff without holding up its worker; permanent
+failures (5xx replies) are not retried.
+"""
+
+import asyncio
+import logging
+import os
+import smtplib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from email.mime.text import MIMEText
+
+from app.services.notification_service import SmtpSender, build_email
+from config import config
+
+logger = logging.getLogger(__name__)
+
+
+def _refused_recipients(error: Exception) -> dict:
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return error.recipients
+    return {}
+
+
+def is_transient_error(error: Exception) -> bool:
+    """True if a delivery that failed with `error` may succeed when retried."""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    if isinstance(error, smtplib.SMTPServerDisconnected):
+        return True
+    if isinstance(error, smtplib.SMTPException):
+        return False
+    return isinstance(error, OSError)
+
+
+@dataclass
+class DeliveryResult:
+    """
+    Outcome of delivering one queued email.
+
+    `refused` maps the recipients the server refused to its reply, as
+    `smtplib.SMTP.sendmail` reports them.
+    """
+
+    recipients: list[str]
+    delivered: bool
+    attempts: int = 0
+    error: str | None = None
+    refused: dict = field(default_factory=dict)
+
+
+@dataclass
+class EmailJob:
+    """A queued message and the future its delivery outcome is set on."""
+
+    message: MIMEText
+    recipients: list[str]
+    future: asyncio.Future
+    attempts: int = 0
+    label: str = ""
+
+    def resolve(
+        self, delivered: bool, error: str | None = None, refused: dict | None = None
+    ) -> None:
+        if not self.future.done():
+            self.future.set_result(
+                DeliveryResult(
+                    self.recipients, delivered, self.attempts, error, refused or {}
+                )
+            )
+
+
+class EmailDeliveryQueue:
+    """
+    Delivers emails in the background with bounded concurrency.
+
+    Use as an async context manager: `submit()` queues a message and returns
+    a future that resolves to its DeliveryResult once it was delivered or has
+    finally failed; leaving the block waits until every queued message is
+    done, then closes the SMTP sessions.
+    """
+
+    def __init__(
+        self,
+        app_config=None,
+        concurrency: int | None = None,
+        max_attempts: int | None = None,
+        retry_base_seconds: float | None = None,
+    ):
+        """
+        Args:
+            app_config: The application configuration object. If None, loads
+                default config.
+            concurrency: Workers (and SMTP sessions); defaults to
+                MAIL_CONCURRENCY.
+            max_attempts: Delivery attempts per message; defaults to
+                MAIL_MAX_ATTEMPTS.
+            retry_base_seconds: Delay before the first retry, doubled for
+                each further one; defaults to MAIL_RETRY_BASE_SECONDS.
+        """
+        if app_config is None:
+            app_config = config[os.getenv("APP_ENV", "development")]
+        self.app_config = app_config
+        self.concurrency = max(1, concurrency or app_config.MAIL_CONCURRENCY)
+        self.max_attempts = max(1, max_attempts or app_config.MAIL_MAX_ATTEMPTS)
+        self.retry_base_seconds = (
+            app_config.MAIL_RETRY_BASE_SECONDS
+            if retry_base_seconds is None
+            else retry_base_seconds
+        )
+        self._queue: asyncio.Queue[EmailJob] = asyncio.Queue()
+        self._executor: ThreadPoolExecutor | None = None
+        self._senders: list[SmtpSender] = []
+        self._workers: list[asyncio.Task] = []
+        self._retries: set[asyncio.Task] = set()
+        self._pending: set[asyncio.Future] = set()
+
+    async def __aenter__(self) -> "EmailDeliveryQueue":
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            await self.drain()
+        await self.stop()
+
+    def start(self) -> None:
+        """Starts the workers."""
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="smtp"
+        )
+        self._senders = [SmtpSender(self.app_config) for _ in range(self.concurrency)]
+        self._workers = [
+            asyncio.create_task(self._worker(sender)) for sender in self._senders
+        ]
+        logger.info(f"Email delivery queue started with {self.concurrency} workers.")
+
+    def submit(
+        self,
+        subject: str,
+        body: str,
+        recipients: list[str],
+        label: str = "",
+        unsubscribe_url: str | None = None,
+    ) -> asyncio.Future:
+        """
+        Queues a plain-text email.
+
+        Args:
+            subject: The email subject.
+            body: The email body (plain text).
+            recipients: A list of recipient email addresses.
+            label: Describes the message in log entries.
+            unsubscribe_url: Unsubscribe link for the List-Unsubscribe headers.
+
+        Returns:
+            A future resolving to the email's DeliveryResult.
+        """
+        future = asyncio.get_running_loop().create_future()
+        if not self.app_config.MAIL_SERVER:
+            logger.error("Mail server not configured. Cannot send email.")
+            future.set_result(
+                DeliveryResult(recipients, False, error="Mail server not configured")
+            )
+            return future
+
+        message = build_email(
+            subject,
+            body,
+            self.app_config.MAIL_DEFAULT_SENDER,
+            recipients,
+            unsubscribe_url=unsubscribe_url,
+        )
+        job = EmailJob(message, recipients, future, label=label or subject)
+        self._pending.add(future)
+        future.add_done_callback(self._pending.discard)
+        self._queue.put_nowait(job)
+        return future
+
+    async def drain(self) -> None:
+        """Waits until every submitted email is delivered or has given up."""
+        if self._pending:
+            await asyncio.wait(set(self._pending))
+
+    async def stop(self) -> None:
+        """Stops the workers, abandoning undelivered emails, and closes the sessions."""
+        for task in [*self._workers, *self._retries]:
+            task.cancel()
+        await asyncio.gather(*self._workers, *self._retries, return_exceptions=True)
+        for future in list(self._pending):
+            future.cancel()
+        if self._executor is not None:
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(
+                *(
+                    loop.run_in_executor(self._executor, sender.close)
+                    for sender in self._senders
+                ),
+                return_exceptions=True,
+            )
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self._workers = []
+        logger.info("Email delivery queue stopped.")
+
+    async def _worker(self, sender: SmtpSender) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._deliver(sender, job)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception(f"Unexpected error delivering '{job.label}'.")
+                job.resolve(False, error="Unexpected error")
+            finally:
+                self._queue.task_done()
+
+    async def _deliver(self, sender: SmtpSender, job: EmailJob) -> None:
+        job.attempts += 1
+        loop = asyncio.get_running_loop()
+        try:
+            refused = await loop.run_in_executor(
+                self._executor, sender.send_message, job.message, job.recipients
+            )
+        except Exception as e:
+            if is_transient_error(e) and job.attempts < self.max_attempts:
+                delay = self.retry_base_seconds * 2 ** (job.attempts - 1)
+                logger.warning(
+                    f"Delivery of '{job.label}' failed (attempt {job.attempts}/"
+                    f"{self.max_attempts}): {e}. Retrying in {delay:g}s."
+                )
+                retry = asyncio.create_task(self._retry_later(job, delay))
+                self._retries.add(retry)
+                retry.add_done_callback(self._retries.discard)
+                return
+            logger.error(
+                f"Delivery of '{job.label}' failed after {job.attempts} attempt(s): {e}"
+            )
+            job.resolve(False, error=str(e), refused=_refused_recipients(e))
+            return
+
+        if refused:
+            logger.error(f"Email '{job.label}' refused for {sorted(refused)}.")
+            job.resolve(False, error="Recipients refused", refused=refused)
+        else:
+            logger.info(f"Email '{job.label}' sent successfully to {job.recipients}.")
+            job.resolve(True)
+
+    async def _retry_later(self, job: EmailJob, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._queue.put_nowait(job)
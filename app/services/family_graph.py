@@ -0,0 +1,350 @@
+"""
+Compact, array-backed adjacency index over family members.
+
+Member IDs are interned to dense integers `0..n-1` and parent/child/spouse
+edges are stored in CSR form (compressed sparse rows): for node `i` its
+neighbours are `targets[offsets[i]:offsets[i + 1]]`. Traversals then run as
+integer loops over `array('i')` buffers instead of dicts of string sets.
+"""
+
+from array import array
+from collections import deque
+from collections.abc import Iterable
+
+from app.models.relation import RelationTypeEnum
+
+
+class AdjacencyCSR:
+    """One edge kind (e.g. parent -> child) stored as CSR offsets/targets arrays."""
+
+    __slots__ = ("offsets", "targets")
+
+    def __init__(self, node_count: int, sources: array, destinations: array):
+        # Counting sort of the edge list by source node.
+        offsets = array("i", [0]) * (node_count + 1)
+        for source in sources:
+            offsets[source + 1] += 1
+        for i in range(node_count):
+            offsets[i + 1] += offsets[i]
+
+        targets = array("i", [0]) * len(sources)
+        cursor = offsets[:-1]
+        for source, destination in zip(sources, destinations):
+            targets[cursor[source]] = destination
+            cursor[source] += 1
+
+        self.offsets = offsets
+        self.targets = targets
+
+    def neighbors(self, node: int) -> array:
+        """Returns the neighbours of `node` as a (copied) slice of the targets array."""
+        return self.targets[self.offsets[node] : self.offsets[node + 1]]
+
+    def degree(self, node: int) -> int:
+        return self.offsets[node + 1] - self.offsets[node]
+
+
+class DescendantClosure:
+    """
+    Precomputed descendant sets for a fixed list of root nodes, stored as one
+    packed bitset (bit `i` = node `i`) per root.
+    """
+
+    __slots__ = ("roots", "_positions", "_bitsets")
+
+    def __init__(self, roots: list[int], bitsets: list[bytearray]):
+        self.roots = roots
+        self._positions = {root: position for position, root in enumerate(roots)}
+        self._bitsets = bitsets
+
+    def position_of(self, root: int) -> int | None:
+        """Returns the position of `root` in this closure, or None if not a root."""
+        return self._positions.get(root)
+
+    def contains(self, position: int, node: int) -> bool:
+        """Checks whether `node` is the root at `position` or one of its descendants."""
+        return bool(self._bitsets[position][node >> 3] >> (node & 7) & 1)
+
+    def contains_any(self, node: int) -> bool:
+        """Checks whether `node` descends from (or is) any of the roots."""
+        byte, bit = node >> 3, node & 7
+        return any(bitset[byte] >> bit & 1 for bitset in self._bitsets)
+
+
+class FamilyGraph:
+    """Immutable parent/child/spouse index over a fixed set of family members."""
+
+    __slots__ = (
+        "ids",
+        "index",
+        "children",
+        "parents",
+        "spouses",
+        "_topo_order",
+        "_acyclic_count",
+    )
+
+    def __init__(
+        self,
+        ids: list[str],
+        parent_edges: tuple[array, array],
+        spouse_edges: tuple[array, array],
+    ):
+        self.ids = ids
+        self.index = {member_id: i for i, member_id in enumerate(ids)}
+        node_count = len(ids)
+        parent_sources, child_targets = parent_edges
+        self.children = AdjacencyCSR(node_count, parent_sources, child_targets)
+        self.parents = AdjacencyCSR(node_count, child_targets, parent_sources)
+        self.spouses = AdjacencyCSR(node_count, *spouse_edges)
+        self._topo_order: array | None = None
+        self._acyclic_count = 0
+
+    @classmethod
+    def from_relations(
+        cls,
+        member_ids: Iterable[str],
+        relations: Iterable[tuple[str, str, str]],
+    ) -> "FamilyGraph":
+        """
+        Builds the graph from member IDs and `(from_id, to_id, relation_type)`
+        tuples. PARENT relations point from parent to child; SPOUSE relations are
+        treated as undirected. Relations touching unknown members are ignored.
+
+        Args:
+            member_ids: All member IDs, in the order they should be interned.
+            relations: Relation tuples; `relation_type` is the enum value string.
+
+        Returns:
+            A FamilyGraph instance.
+        """
+        ids = list(member_ids)
+        index = {member_id: i for i, member_id in enumerate(ids)}
+        parent_sources, child_targets = array("i"), array("i")
+        spouse_pairs: set[tuple[int, int]] = set()
+
+        for from_id, to_id, relation_type in relations:
+            source = index.get(from_id)
+            target = index.get(to_id)
+            if source is None or target is None or source == target:
+                continue
+            if relation_type == RelationTypeEnum.PARENT.value:
+                parent_sources.append(source)
+                child_targets.append(target)
+            elif relation_type == RelationTypeEnum.SPOUSE.value:
+                spouse_pairs.add((min(source, target), max(source, target)))
+
+        spouse_sources, spouse_targets = array("i"), array("i")
+        for a, b in spouse_pairs:
+            spouse_sources.extend((a, b))
+            spouse_targets.extend((b, a))
+
+        return cls(
+            ids,
+            (parent_sources, child_targets),
+            (spouse_sources, spouse_targets),
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def index_of(self, member_id: str) -> int | None:
+        """Returns the dense index of a member ID, or None if it is unknown."""
+        return self.index.get(member_id)
+
+    def mark_descendants(self, roots: Iterable[int]) -> bytearray:
+        """
+        Marks every node reachable from `roots` via parent -> child edges.
+
+        Returns:
+            A bytearray of length `len(self)` with 1 for the roots and their
+            descendants and 0 elsewhere.
+        """
+        offsets, targets = self.children.offsets, self.children.targets
+        marked = bytearray(len(self.ids))
+        stack = []
+        for root in roots:
+            if not marked[root]:
+                marked[root] = 1
+                stack.append(root)
+        while stack:
+            node = stack.pop()
+            for edge in range(offsets[node], offsets[node + 1]):
+                child = targets[edge]
+                if not marked[child]:
+                    marked[child] = 1
+                    stack.append(child)
+        return marked
+
+    def topological_order(self) -> array:
+        """
+        Returns all nodes ordered so that parents come before their children
+        (Kahn's algorithm). Nodes caught in parent cycles, which only occur with
+        inconsistent data, are appended at the end.
+        """
+        if self._topo_order is not None:
+            return self._topo_order
+
+        node_count = len(self.ids)
+        offsets, targets = self.children.offsets, self.children.targets
+        pending = array("i", (self.parents.degree(i) for i in range(node_count)))
+        order = array("i", (i for i in range(node_count) if pending[i] == 0))
+        head = 0
+        while head < len(order):
+            node = order[head]
+            head += 1
+            for edge in range(offsets[node], offsets[node + 1]):
+                child = targets[edge]
+                pending[child] -= 1
+                if pending[child] == 0:
+                    order.append(child)
+        self._acyclic_count = len(order)
+        if len(order) < node_count:
+            order.extend(i for i in range(node_count) if pending[i] > 0)
+
+        self._topo_order = order
+        return order
+
+    def parent_cycle_nodes(self) -> list[int]:
+        """
+        Returns the nodes that lie on a parent cycle (or on a path between two
+        cycles), i.e. members recorded as their own ancestors. Empty for
+        consistent data.
+        """
+        order = self.topological_order()
+        remaining = set(order[self._acyclic_count :])
+        if not remaining:
+            return []
+
+        # Kahn's algorithm leaves cycles plus everything below them; peel off
+        # nodes without children in the remainder until only cycles are left.
+        child_offsets, child_targets = self.children.offsets, self.children.targets
+        parent_offsets, parent_targets = self.parents.offsets, self.parents.targets
+        pending = {
+            node: sum(
+                1
+                for edge in range(child_offsets[node], child_offsets[node + 1])
+                if child_targets[edge] in remaining
+            )
+            for node in remaining
+        }
+        stack = [node for node, count in pending.items() if count == 0]
+        while stack:
+            node = stack.pop()
+            remaining.discard(node)
+            for edge in range(parent_offsets[node], parent_offsets[node + 1]):
+                parent = parent_targets[edge]
+                if parent in pending:
+                    pending[parent] -= 1
+                    if pending[parent] == 0:
+                        stack.append(parent)
+        return sorted(remaining)
+
+    def descendant_closure(self, roots: list[int]) -> DescendantClosure:
+        """
+        Computes descendant sets for several roots in one linear pass.
+
+        Each node carries a small integer mask of the roots it descends from;
+        masks flow from parents to children in topological order and are then
+        scattered into one packed bitset per root.
+        """
+        node_count = len(self.ids)
+        offsets, targets = self.children.offsets, self.children.targets
+        masks = [0] * node_count
+        for position, root in enumerate(roots):
+            masks[root] |= 1 << position
+
+        order = self.topological_order()
+        for node in order:
+            mask = masks[node]
+            if mask:
+                for edge in range(offsets[node], offsets[node + 1]):
+                    masks[targets[edge]] |= mask
+
+        # Nodes in or below parent cycles were visited in arbitrary order;
+        # settle their masks to a fixpoint (only happens with inconsistent data).
+        cyclic = order[self._acyclic_count :]
+        changed = bool(cyclic)
+        while changed:
+            changed = False
+            for node in cyclic:
+                mask = masks[node]
+                for edge in range(offsets[node], offsets[node + 1]):
+                    child = targets[edge]
+                    if masks[child] | mask != masks[child]:
+                        masks[child] |= mask
+                        changed = True
+
+        bitsets = [bytearray((node_count + 7) >> 3) for _ in roots]
+        for node, mask in enumerate(masks):
+            while mask:
+                low_bit = mask & -mask
+                bitsets[low_bit.bit_length() - 1][node >> 3] |= 1 << (node & 7)
+                mask ^= low_bit
+        return DescendantClosure(list(roots), bitsets)
+
+    def default_root(self) -> int | None:
+        """
+        Picks a root when none is configured: the parentless member with the
+        longest line of descendants (ties broken by most children, then index).
+        """
+        if not self.ids:
+            return None
+        offsets, targets = self.children.offsets, self.children.targets
+        generations = [1] * len(self.ids)
+        for node in reversed(self.topological_order()):
+            for edge in range(offsets[node], offsets[node + 1]):
+                generations[node] = max(
+                    generations[node], generations[targets[edge]] + 1
+                )
+        founders = [i for i in range(len(self.ids)) if self.parents.degree(i) == 0]
+        if not founders:
+            return 0
+        return min(
+            founders,
+            key=lambda i: (-generations[i], -self.children.degree(i), i),
+        )
+
+    def _walk(self, csr: AdjacencyCSR, start: int, max_depth: int | None) -> dict:
+        """Breadth-first walk returning `{node: depth}` for nodes within `max_depth`."""
+        offsets, targets = csr.offsets, csr.targets
+        depths = {start: 0}
+        queue = deque((start,))
+        while queue:
+            node = queue.popleft()
+            depth = depths[node]
+            if max_depth is not None and depth >= max_depth:
+                continue
+            for edge in range(offsets[node], offsets[node + 1]):
+                neighbour = targets[edge]
+                if neighbour not in depths:
+                    depths[neighbour] = depth + 1
+                    queue.append(neighbour)
+        return depths
+
+    def ancestors(self, node: int, max_depth: int | None = None) -> dict[int, int]:
+        """Returns `{ancestor: generations_up}` for `node` (including itself at 0)."""
+        return self._walk(self.parents, node, max_depth)
+
+    def descendants(self, node: int, max_depth: int | None = None) -> dict[int, int]:
+        """Returns `{descendant: generations_down}` for `node` (including itself at 0)."""
+        return self._walk(self.children, node, max_depth)
+
+    def subtree(
+        self, node: int, up: int, down: int, include_spouses: bool = True
+    ) -> list[int]:
+        """
+        Returns the nodes within `up` generations of ancestors and `down`
+        generations of descendants of `node`, optionally with their spouses.
+
+        Returns:
+            Sorted list of node indices.
+        """
+        selected = set(self.ancestors(node, up))
+        selected.update(self.descendants(node, down))
+        if include_spouses:
+            spouse_offsets, spouse_targets = self.spouses.offsets, self.spouses.targets
+            for member in list(selected):
+                for edge in range(spouse_offsets[member], spouse_offsets[member + 1]):
+                    selected.add(spouse_targets[edge])
+        return sorted(selected)
@@ -1,8 +1,11 @@
+import base64
+import json
 import logging
 import uuid
-from collections import deque  # Use deque for BFS queue
+from collections.abc import AsyncIterator, Iterable
+from datetime import datetime
 
-from sqlalchemy import func, select  # Import func for count
+from sqlalchemy import Table, func, insert, or_, select  # Import func for count
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -17,10 +20,16 @@ from app.schemas.family import (
     FamilyMemberUpdate,
     RelationRead,  # Keep relation schemas
 )
+from app.services import name_index, search_service
+from app.services.family_graph import DescendantClosure, FamilyGraph
+from app.services.graph_version import bump_graph_version, sync_graph_version
 from app.utils.localization import get_text  # For exception messages
 
 logger = logging.getLogger(__name__)
 
+# Rows per executemany INSERT in `bulk_insert_family_data`.
+BULK_INSERT_BATCH_SIZE = 5000
+
 
 # --- Custom Exceptions ---
 class MemberNotFoundError(Exception):
@@ -52,142 +61,389 @@ class InvalidRelationError(Exception):
 # --- Service Functions ---
 
 
-async def get_all_family_members(db: AsyncSession) -> list[FamilyMemberRead]:
+def _member_read_from_row(
+    row,
+    relationships_from: list[RelationRead] | None = None,
+    relationships_to: list[RelationRead] | None = None,
+) -> FamilyMemberRead:
+    """Builds a FamilyMemberRead from a flat family_members row mapping."""
+    name = (
+        f"{row['first_name']} {row['last_name']}"
+        if row["last_name"]
+        else row["first_name"]
+    )
+    return FamilyMemberRead(
+        **{column.name: row[column.name] for column in FamilyMember.__table__.columns},
+        name=name,
+        relationships_from=relationships_from or [],
+        relationships_to=relationships_to or [],
+    )
+
+
+async def _load_members_selectin(db: AsyncSession) -> list[FamilyMemberRead]:
+    """Loads members as ORM objects with their relationships eagerly selectin-loaded."""
+    stmt = (
+        select(FamilyMember)
+        .options(
+            selectinload(FamilyMember.relationships_from).selectinload(
+                Relation.from_member
+            ),
+            selectinload(FamilyMember.relationships_from).selectinload(
+                Relation.to_member
+            ),
+            selectinload(FamilyMember.relationships_to).selectinload(
+                Relation.from_member
+            ),
+            selectinload(FamilyMember.relationships_to).selectinload(
+                Relation.to_member
+            ),
+        )
+        .order_by(FamilyMember.id)
+    )
+    result = await db.execute(stmt)
+    family_members_orm = result.unique().scalars().all()
+    return [FamilyMemberRead.model_validate(m) for m in family_members_orm]
+
+
+async def _load_members_flat(db: AsyncSession) -> list[FamilyMemberRead]:
     """
-    Fetches all family members from the database with their relationships preloaded,
-    calculates the 'is_descendant' flag based on parent-child relationships
-    starting from root nodes within the dataset.
+    Loads members with exactly two queries: one flat SELECT of family_members
+    and one of relations, stitched into per-member adjacency lists in Python.
+    """
+    member_stmt = select(*FamilyMember.__table__.columns).order_by(FamilyMember.id)
+    relation_stmt = select(*Relation.__table__.columns).order_by(Relation.id)
+    member_rows = (await db.execute(member_stmt)).mappings().all()
+    relation_rows = (await db.execute(relation_stmt)).mappings().all()
+
+    relationships_from: dict[str, list[RelationRead]] = {
+        row["id"]: [] for row in member_rows
+    }
+    relationships_to: dict[str, list[RelationRead]] = {
+        row["id"]: [] for row in member_rows
+    }
+    for row in relation_rows:
+        relation = RelationRead(
+            id=row["id"],
+            from_member_id=row["from_member_id"],
+            to_member_id=row["to_member_id"],
+            relation_type=row["relation_type"].value,
+            start_date=row["start_date"],
+            end_date=row["end_date"],
+        )
+        if row["from_member_id"] in relationships_from:
+            relationships_from[row["from_member_id"]].append(relation)
+        if row["to_member_id"] in relationships_to:
+            relationships_to[row["to_member_id"]].append(relation)
+
+    return [
+        _member_read_from_row(
+            row, relationships_from[row["id"]], relationships_to[row["id"]]
+        )
+        for row in member_rows
+    ]
+
+
+def build_family_graph(members: list[FamilyMemberRead]) -> FamilyGraph:
+    """Builds the array-backed relationship index for a list of loaded members."""
+    return FamilyGraph.from_relations(
+        (m.id for m in members),
+        (
+            (rel.from_member_id, rel.to_member_id, rel.relation_type)
+            for m in members
+            for rel in m.relationships_from
+        ),
+    )
+
+
+def resolve_tree_roots(graph: FamilyGraph, root_ids: list[str]) -> list[int]:
+    """
+    Maps configured root member IDs to graph indices, falling back to the
+    graph's default root (the founder with the longest line of descendants)
+    when none of them exist.
+    """
+    roots = []
+    for root_id in root_ids:
+        root = graph.index_of(root_id)
+        if root is None:
+            logger.warning(f"Configured family tree root '{root_id}' does not exist.")
+            continue
+        roots.append(root)
+    if not roots:
+        default_root = graph.default_root()
+        if default_root is not None:
+            roots.append(default_root)
+    return roots
+
+
+async def get_family_tree_data(
+    db: AsyncSession, lean: bool = True, root_ids: list[str] | None = None
+) -> tuple[list[FamilyMemberRead], FamilyGraph, DescendantClosure]:
+    """
+    Fetches all family members with their relationships, builds the
+    FamilyGraph index over them and precomputes the descendants of the tree
+    roots. A member's 'is_descendant' flag is set if it descends from (or is)
+    any of the roots.
 
     Args:
         db: The asynchronous database session.
+        lean: If True (default), load members and relations with two flat
+            queries. If False, use the ORM selectinload path (kept for
+            benchmarking, see scripts/benchmark_tree_loading.py).
+        root_ids: Member IDs to treat as tree roots. If empty or None, the
+            graph's default root is used.
 
     Returns:
-        A list of FamilyMemberRead Pydantic models, including the calculated
-        'is_descendant' flag.
+        A tuple of the FamilyMemberRead list (ordered by ID, with
+        'is_descendant' set), the FamilyGraph built over it and the
+        DescendantClosure of the resolved roots.
     """
-    logger.info("Fetching all family members from database.")
+    logger.info(f"Fetching all family members from database (lean={lean}).")
     try:
-        stmt = (
-            select(FamilyMember)
-            .options(
-                selectinload(FamilyMember.relationships_from).selectinload(
-                    Relation.from_member
-                ),
-                selectinload(FamilyMember.relationships_from).selectinload(
-                    Relation.to_member
-                ),
-                selectinload(FamilyMember.relationships_to).selectinload(
-                    Relation.from_member
-                ),
-                selectinload(FamilyMember.relationships_to).selectinload(
-                    Relation.to_member
-                ),
-            )
-            .order_by(FamilyMember.id)
-        )
-        result = await db.execute(stmt)
-        family_members_orm = result.unique().scalars().all()
-        logger.info(f"Successfully fetched {len(family_members_orm)} family members.")
-
-        if not family_members_orm:
-            return []
-
-        members_dict: dict[int, FamilyMember] = {m.id: m for m in family_members_orm}
-        child_map: dict[int, set[int]] = {m_id: set() for m_id in members_dict}
-        for member in family_members_orm:
-            for rel in member.relationships_from:
-                if rel.relation_type == RelationTypeEnum.PARENT:
-                    if rel.to_member_id in members_dict:
-                        child_map[member.id].add(rel.to_member_id)
-
-        if not members_dict:
-            primary_root_ids = set()
+        if lean:
+            family_members_read = await _load_members_flat(db)
         else:
-            min_id = min(members_dict.keys())
-            primary_root_ids = {min_id}
+            family_members_read = await _load_members_selectin(db)
+        logger.info(f"Successfully fetched {len(family_members_read)} family members.")
 
-        logger.debug(
-            f"Identified primary root member(s) (heuristic - lowest ID): {primary_root_ids}"
-        )
+        graph = build_family_graph(family_members_read)
+        roots = resolve_tree_roots(graph, root_ids or [])
+        logger.debug(f"Resolved family tree root(s): {[graph.ids[r] for r in roots]}")
 
-        descendant_ids: set[int] = set()
-        if primary_root_ids:
-            descendant_ids.update(primary_root_ids)
-            queue = deque(primary_root_ids)
-            while queue:
-                current_id = queue.popleft()
-                children = child_map.get(current_id, set())
-                for child_id in children:
-                    if child_id in members_dict and child_id not in descendant_ids:
-                        descendant_ids.add(child_id)
-                        queue.append(child_id)
+        closure = graph.descendant_closure(roots)
+        for i, member_read in enumerate(family_members_read):
+            member_read.is_descendant = closure.contains_any(i)
 
-        logger.debug(
-            f"Identified descendant members (IDs) from primary root(s): {descendant_ids}"
-        )
-
-        family_members_read: list[FamilyMemberRead] = []
-        for member in family_members_orm:
-            member_read = FamilyMemberRead.model_validate(member)
-            member_read.is_descendant = member.id in descendant_ids
-            family_members_read.append(member_read)
-
-        logger.debug(
-            f"Family members Pydantic data with is_descendant flag being returned: {family_members_read}"
-        )
-        return family_members_read
+        return family_members_read, graph, closure
 
     except Exception as e:
         logger.exception("Error fetching or processing family members.", exc_info=True)
         raise e
 
 
+async def get_all_family_members(
+    db: AsyncSession, lean: bool = True
+) -> list[FamilyMemberRead]:
+    """
+    Fetches all family members from the database with their relationships,
+    including the calculated 'is_descendant' flag.
+
+    Args:
+        db: The asynchronous database session.
+        lean: Whether to use the two-query flat load (see get_family_tree_data).
+
+    Returns:
+        A list of FamilyMemberRead Pydantic models.
+    """
+    family_members_read, _, _ = await get_family_tree_data(db, lean=lean)
+    return family_members_read
+
+
+async def iter_family_members(db: AsyncSession) -> AsyncIterator[FamilyMemberRead]:
+    """
+    Yields all family members one at a time from a server-side cursor, each with
+    its relationships attached. 'is_descendant' is left unset because it needs
+    the whole graph.
+
+    A single members LEFT JOIN relations query ordered by member ID is streamed,
+    and consecutive rows are grouped per member, so memory use does not grow
+    with the number of members.
+
+    Args:
+        db: The asynchronous database session.
+
+    Yields:
+        FamilyMemberRead models in member ID order.
+    """
+    stmt = (
+        select(
+            *FamilyMember.__table__.columns,
+            Relation.id.label("relation_id"),
+            Relation.from_member_id.label("relation_from_member_id"),
+            Relation.to_member_id.label("relation_to_member_id"),
+            Relation.relation_type.label("relation_type"),
+            Relation.start_date.label("relation_start_date"),
+            Relation.end_date.label("relation_end_date"),
+        )
+        .outerjoin(
+            Relation,
+            or_(
+                Relation.from_member_id == FamilyMember.id,
+                Relation.to_member_id == FamilyMember.id,
+            ),
+        )
+        .order_by(FamilyMember.id, Relation.id)
+        .execution_options(yield_per=500)
+    )
+
+    result = await db.stream(stmt)
+    current_row = None
+    relationships_from: list[RelationRead] = []
+    relationships_to: list[RelationRead] = []
+    async for row in result.mappings():
+        if current_row is not None and row["id"] != current_row["id"]:
+            yield _member_read_from_row(
+                current_row, relationships_from, relationships_to
+            )
+            relationships_from, relationships_to = [], []
+        current_row = row
+
+        if row["relation_id"] is None:
+            continue
+        relation = RelationRead(
+            id=row["relation_id"],
+            from_member_id=row["relation_from_member_id"],
+            to_member_id=row["relation_to_member_id"],
+            relation_type=row["relation_type"].value,
+            start_date=row["relation_start_date"],
+            end_date=row["relation_end_date"],
+        )
+        if relation.from_member_id == row["id"]:
+            relationships_from.append(relation)
+        if relation.to_member_id == row["id"]:
+            relationships_to.append(relation)
+
+    if current_row is not None:
+        yield _member_read_from_row(current_row, relationships_from, relationships_to)
+
+
+class InvalidCursorError(Exception):
+    """Custom exception for malformed or tampered pagination cursors."""
+
+    def __init__(self, cursor: str):
+        self.cursor = cursor
+        super().__init__(get_text("error_invalid_cursor"))
+
+
+def encode_member_cursor(member_id: str) -> str:
+    """Encodes the last member ID of a page into an opaque pagination cursor."""
+    payload = json.dumps({"after": member_id}).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_member_cursor(cursor: str) -> str:
+    """
+    Decodes a cursor produced by encode_member_cursor.
+
+    Raises:
+        InvalidCursorError: If the cursor cannot be decoded.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        after = json.loads(base64.urlsafe_b64decode(padded))["after"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError(cursor) from e
+    if not isinstance(after, str):
+        raise InvalidCursorError(cursor)
+    return after
+
+
+# Match counts per search term, valid for one graph version.
+_COUNT_CACHE_MAX_ENTRIES = 128
+_count_cache: dict[tuple[int, str], int] = {}
+
+
+async def _count_family_members(
+    db: AsyncSession, search_filter, search_term: str
+) -> int:
+    """
+    Counts members matching a filter, caching the result per search term.
+
+    The cache key syncs the graph version first, so counts also follow writes
+    made by other processes, such as the scheduler's ingest.
+    """
+    key = (await sync_graph_version(db), search_term)
+    cached = _count_cache.get(key)
+    if cached is not None:
+        return cached
+
+    count_query = select(func.count(FamilyMember.id))
+    if search_filter is not None:
+        count_query = count_query.where(search_filter)
+    total_items = (await db.execute(count_query)).scalar_one()
+
+    if len(_count_cache) >= _COUNT_CACHE_MAX_ENTRIES or any(
+        version != key[0] for version, _ in _count_cache
+    ):
+        _count_cache.clear()
+    _count_cache[key] = total_items
+    return total_items
+
+
 async def get_paginated_family_members(
-    db: AsyncSession, skip: int = 0, limit: int = 10, search_term: str | None = None
-) -> tuple[list[FamilyMemberRead], int]:
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 10,
+    search_term: str | None = None,
+    cursor: str | None = None,
+    include_total: bool = True,
+) -> tuple[list[FamilyMemberRead], int | None, str | None]:
     """
-    Fetches a paginated list of family members from the database, optionally filtering by a search term.
+    Fetches a page of family members ordered by ID, optionally filtering by a search term.
     Does not preload relationships for efficiency in list view.
 
+    With a `cursor`, the page starts right after the member the cursor points
+    to (keyset pagination), so the cost does not depend on how deep the page
+    is; `skip` is ignored. Without one, `skip` is used as an offset.
+
     Args:
         db: The asynchronous database session.
-        skip: The number of records to skip (for pagination).
+        skip: The number of records to skip (offset pagination).
         limit: The maximum number of records to return (page size).
+        search_term: Optional term to filter members by name.
+        cursor: Opaque cursor returned as `next_cursor` by a previous call.
+        include_total: Whether to count all matching members. Counts are
+            cached per search term until the family data changes.
 
     Returns:
         A tuple containing:
             - A list of FamilyMemberRead Pydantic models for the current page.
-            - The total number of family members matching the criteria.
+            - The total number of matching members, or None if not requested.
+            - The cursor for the next page, or None if this is the last page.
+
+    Raises:
+        InvalidCursorError: If `cursor` is malformed.
     """
     logger.info(
-        f"Fetching paginated family members: skip={skip}, limit={limit}, search='{search_term}'"
+        f"Fetching paginated family members: skip={skip}, limit={limit}, search='{search_term}', cursor={cursor}"
     )
+    after_id = decode_member_cursor(cursor) if cursor else None
 
     try:
-        base_query = select(FamilyMember)
-        count_query = select(func.count(FamilyMember.id))
+        search_filter = None
+        items_stmt = select(*FamilyMember.__table__.columns)
 
         if search_term:
-            search_filter = FamilyMember.name.ilike(f"%{search_term}%")
-            base_query = base_query.where(search_filter)
-            count_query = count_query.where(search_filter)
+            search_filter = await search_service.member_search_filter(db, search_term)
+            if search_filter is not None:
+                items_stmt = items_stmt.where(search_filter)
 
-        items_stmt = base_query.order_by(FamilyMember.id).offset(skip).limit(limit)
-        items_result = await db.execute(items_stmt)
-        members_orm = items_result.scalars().all()
-        members_read = [FamilyMemberRead.model_validate(m) for m in members_orm]
+        if after_id is not None:
+            items_stmt = items_stmt.where(FamilyMember.id > after_id)
+        else:
+            items_stmt = items_stmt.offset(skip)
+
+        # Fetch one extra row to learn whether another page follows.
+        items_stmt = items_stmt.order_by(FamilyMember.id).limit(limit + 1)
+        rows = (await db.execute(items_stmt)).mappings().all()
+        members_read = [_member_read_from_row(row) for row in rows[:limit]]
+        next_cursor = (
+            encode_member_cursor(members_read[-1].id) if len(rows) > limit else None
+        )
 
-        total_items_result = await db.execute(count_query)
-        total_items = total_items_result.scalar_one()
+        total_items = None
+        if include_total:
+            total_items = await _count_family_members(
+                db, search_filter, search_term or ""
+            )
 
         logger.info(
             f"Successfully fetched {len(members_read)} members (page) matching search='{search_term}' out of {total_items} total."
         )
-        return members_read, total_items
+        return members_read, total_items, next_cursor
 
     except Exception as e:
         logger.exception(
-            f"Error fetching paginated family members (skip={skip}, limit={limit}).",
+            f"Error fetching paginated family members (skip={skip}, limit={limit}, cursor={cursor}).",
             exc_info=True,
         )
         raise e
@@ -269,6 +525,14 @@ async def create_family_member(
         await db.flush()
         await db.refresh(new_member_orm)
         await db.commit()
+        version = bump_graph_version("member created")
+        name_index.apply_member_upsert(
+            version,
+            new_member_orm.id,
+            new_member_orm.first_name,
+            new_member_orm.last_name,
+            new_member_orm.birth_date,
+        )
         logger.info(
             f"Successfully created member ID {new_member_orm.id}: {member_data.first_name} {member_data.last_name}"
         )
@@ -311,13 +575,10 @@ async def update_family_member(
 
     update_data = member_data.model_dump(exclude_unset=True)
 
-    current_parts = member_orm.name.split(" ")
-    if "last_name" in update_data:
-        current_parts[0] = update_data["last_name"]
     if "first_name" in update_data:
-        current_parts[1] = update_data["first_name"]
-    member_orm.name = " ".join(filter(None, current_parts))
-
+        member_orm.first_name = update_data["first_name"]
+    if "last_name" in update_data:
+        member_orm.last_name = update_data["last_name"]
     if "birth_date" in update_data:
         member_orm.birth_date = update_data["birth_date"]
     if "death_date" in update_data:
@@ -333,8 +594,16 @@ async def update_family_member(
         await db.flush()
         await db.refresh(member_orm)
         await db.commit()
+        version = bump_graph_version("member updated")
+        name_index.apply_member_upsert(
+            version,
+            member_orm.id,
+            member_orm.first_name,
+            member_orm.last_name,
+            member_orm.birth_date,
+        )
         logger.info(f"Successfully updated member ID {member_id}.")
-        return FamilyMemberRead.model_validate(member_orm)
+        return await get_member_by_id(db, member_id)
     except Exception as e:
         await db.rollback()
         logger.exception(
@@ -367,6 +636,8 @@ async def delete_family_member(db: AsyncSession, member_id: int) -> None:
     try:
         await db.delete(member_orm)
         await db.commit()
+        version = bump_graph_version("member deleted")
+        name_index.apply_member_removal(version, [member_id])
         logger.info(f"Successfully deleted member ID {member_id}.")
     except Exception as e:
         await db.rollback()
@@ -422,6 +693,8 @@ async def create_relationship(
         await db.flush()
         await db.refresh(new_relation_orm)
         await db.commit()
+        version = bump_graph_version("relationship created")
+        name_index.apply_relation_change(version)
         logger.info(f"Successfully created relationship ID {new_relation_orm.id}")
         return RelationRead.model_validate(new_relation_orm)
     except Exception as e:
@@ -433,6 +706,104 @@ async def create_relationship(
         raise e
 
 
+async def bulk_insert_family_data(
+    db: AsyncSession,
+    members: list[dict],
+    relations: Iterable[tuple[str, str, RelationTypeEnum]],
+    existing_member_ids: Iterable[str] = (),
+    commit: bool = True,
+    member_table: Table = FamilyMember.__table__,
+    relation_table: Table = Relation.__table__,
+) -> tuple[int, int]:
+    """
+    Inserts many members and relations with batched executemany INSERTs.
+
+    Unlike `create_family_member`/`create_relationship`, nothing is flushed,
+    refreshed or looked up per row: relation endpoints are checked against the
+    IDs of `members` plus `existing_member_ids` in memory, and relations that
+    reference unknown members or point at themselves are skipped.
+
+    Args:
+        db: The asynchronous database session.
+        members: Column dicts for new members; each must contain `id`.
+        relations: `(from_member_id, to_member_id, relation_type)` tuples.
+        existing_member_ids: IDs already in the database that relations may use.
+        commit: Whether to commit. Pass False to make the inserts part of a
+            larger transaction; the caller then commits and bumps the graph version.
+        member_table: Table the members are inserted into.
+        relation_table: Table the relations are inserted into. Both default to
+            the family tables; the ingest passes its shadow tables. Timestamps
+            are only set on tables that have them.
+
+    Returns:
+        The number of inserted members and relations.
+    """
+    now = datetime.utcnow()
+    member_stamps = (
+        {"created_at": now, "updated_at": now} if "created_at" in member_table.c else {}
+    )
+    relation_stamps = (
+        {"created_at": now, "updated_at": now}
+        if "created_at" in relation_table.c
+        else {}
+    )
+    known_ids = set(existing_member_ids)
+    known_ids.update(member["id"] for member in members)
+
+    relation_count = 0
+    skipped = 0
+    try:
+        for start in range(0, len(members), BULK_INSERT_BATCH_SIZE):
+            await db.execute(
+                insert(member_table),
+                [
+                    {**member_stamps, **member}
+                    for member in members[start : start + BULK_INSERT_BATCH_SIZE]
+                ],
+            )
+        # Rows are built a batch at a time, so `relations` may be a large stream.
+        relation_rows = []
+        for from_id, to_id, relation_type in relations:
+            if from_id == to_id or from_id not in known_ids or to_id not in known_ids:
+                skipped += 1
+                continue
+            relation_rows.append(
+                {
+                    "from_member_id": from_id,
+                    "to_member_id": to_id,
+                    "relation_type": relation_type,
+                    **relation_stamps,
+                }
+            )
+            if len(relation_rows) == BULK_INSERT_BATCH_SIZE:
+                await db.execute(insert(relation_table), relation_rows)
+                relation_count += len(relation_rows)
+                relation_rows = []
+        if relation_rows:
+            await db.execute(insert(relation_table), relation_rows)
+            relation_count += len(relation_rows)
+        if skipped:
+            logger.warning(
+                f"Bulk insert: skipped {skipped} relations with invalid endpoints."
+            )
+        logger.debug(
+            f"Bulk inserted {len(members)} members and {relation_count} relations "
+            f"into {member_table.name}/{relation_table.name}."
+        )
+
+        if commit:
+            await db.commit()
+            bump_graph_version("bulk insert")
+        return len(members), relation_count
+    except Exception as e:
+        await db.rollback()
+        logger.exception(
+            f"Database error during bulk insert of {len(members)} members.",
+            exc_info=True,
+        )
+        raise e
+
+
 async def delete_relationship(db: AsyncSession, relation_id: int) -> None:
     """
     Deletes a relationship from the database.
@@ -458,6 +829,8 @@ async def delete_relationship(db: AsyncSession, relation_id: int) -> None:
     try:
         await db.delete(relation_orm)
         await db.commit()
+        version = bump_graph_version("relationship deleted")
+        name_index.apply_relation_change(version)
         logger.info(f"Successfully deleted relationship ID {relation_id}.")
     except Exception as e:
         await db.rollback()
@@ -514,6 +887,8 @@ async def delete_multiple_family_members(
             await db.delete(member)
             deleted_count += 1
         await db.commit()  # Commit the transaction after all deletions are staged
+        version = bump_graph_version("members batch deleted")
+        name_index.apply_member_removal(version, found_ids)
         logger.info(f"Successfully batch deleted {deleted_count} members.")
         return deleted_count
     except Exception as e:
@@ -0,0 +1,104 @@
+import logging
+import os
+import time
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import FamilyMember, Relation
+from config import config
+
+logger = logging.getLogger(__name__)
+
+config_name = os.getenv("APP_ENV", "development")
+app_config = config[config_name]
+
+# Monotonic, process-wide version of the family graph. Every successful write to
+# family_members/relations bumps it so in-memory views can tell they are stale.
+_graph_version = 0
+
+# Last database stamp seen by `sync_graph_version`, and when it was read.
+_last_stamp: tuple | None = None
+_last_checked = 0.0
+
+
+def get_graph_version() -> int:
+    """Returns the current process-wide family graph version."""
+    return _graph_version
+
+
+def bump_graph_version(reason: str = "") -> int:
+    """
+    Marks the in-memory family graph as stale by incrementing its version.
+
+    Args:
+        reason: Short description of the change, used for logging only.
+
+    Returns:
+        The new graph version.
+    """
+    global _graph_version, _last_stamp
+    _graph_version += 1
+    # The write that caused this bump also changed the database stamp; take a
+    # fresh baseline on the next sync instead of reporting it as external.
+    _last_stamp = None
+    logger.debug(f"Family graph version bumped to {_graph_version} ({reason}).")
+    return _graph_version
+
+
+async def get_family_data_stamp(db: AsyncSession) -> tuple:
+    """
+    Returns a cheap fingerprint of the family_members and relations tables.
+
+    The row counts and latest `updated_at` values change whenever rows are added,
+    removed or modified, including by other processes (e.g. the scheduler's
+    ingest job), so the stamp can be used to detect stale in-memory views.
+
+    Args:
+        db: The asynchronous database session.
+
+    Returns:
+        A tuple of (member count, latest member update, relation count,
+        latest relation update).
+    """
+    members_stmt = select(
+        func.count(FamilyMember.id), func.max(FamilyMember.updated_at)
+    )
+    relations_stmt = select(func.count(Relation.id), func.max(Relation.updated_at))
+    members_row = (await db.execute(members_stmt)).one()
+    relations_row = (await db.execute(relations_stmt)).one()
+    return (*members_row, *relations_row)
+
+
+async def sync_graph_version(db: AsyncSession) -> int:
+    """
+    Returns the graph version after accounting for writes made by other processes.
+
+    Writes made through this process bump the version directly. Writes made
+    elsewhere (the scheduler runs ingest in its own container) are caught by
+    re-reading the database stamp at most once per configured interval. Callers
+    building an in-memory view should sync before loading data, so a write
+    racing with the load is seen as a change on the next check.
+
+    Args:
+        db: The asynchronous database session.
+
+    Returns:
+        The current graph version.
+    """
+    global _last_stamp, _last_checked
+
+    now = time.monotonic()
+    if (
+        _last_stamp is not None
+        and now - _last_checked < app_config.TREE_CACHE_STAMP_INTERVAL_SECONDS
+    ):
+        return _graph_version
+
+    stamp = await get_family_data_stamp(db)
+    if _last_stamp is not None and stamp != _last_stamp:
+        logger.info("Family data changed outside this process.")
+        bump_graph_version("external change detected")
+    _last_stamp = stamp
+    _last_checked = now
+    return _graph_version
@@ -0,0 +1,343 @@
+"""
+Diff-based synchronisation of the family tables with an external source.
+
+A source (e.g. the Google Sheet) yields one `MemberRecord` per member. The
+records are first streamed into shadow tables in the connection's TEMP
+schema, which lives outside the main database file, so loading takes no lock
+on the live tables however long the source takes. The differences are then
+applied with a handful of set-based statements, keyed by the source's member
+`id`: only new, changed and removed members and relations are written, so
+unchanged members keep their `created_at`.
+
+The apply runs in the same transaction as the load, but the main database is
+only touched once loading is done, which keeps the write lock short. Readers
+see either the old or the new tree, never a half-loaded one.
+"""
+
+import hashlib
+import logging
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+from typing import NamedTuple
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    MetaData,
+    String,
+    Table,
+    delete,
+    exists,
+    insert,
+    literal,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.schema import CreateTable, DropTable
+
+from app.models import FamilyMember, IngestState, Relation
+from app.models.relation import RelationTypeEnum
+from app.services import family_service
+from app.services.graph_version import bump_graph_version
+
+logger = logging.getLogger(__name__)
+
+# Member columns owned by the source; anything else (timestamps) is ours.
+MEMBER_FIELDS = (
+    "first_name",
+    "last_name",
+    "birth_date",
+    "death_date",
+    "gender",
+    "location",
+    "notes",
+)
+
+# Records read from the source per shadow-table write.
+STAGING_BATCH_SIZE = 5000
+
+RelationKey = tuple[str, str, RelationTypeEnum]
+
+
+class MemberRecord(NamedTuple):
+    """
+    One member as provided by a source.
+
+    `fields` holds the `MEMBER_FIELDS` values. `relations` are the relations
+    the source states for this member as `(from_id, to_id, relation_type)`;
+    their other endpoint may only appear later in the stream.
+    """
+
+    id: str
+    fields: dict
+    relations: tuple[RelationKey, ...] = ()
+
+
+@dataclass
+class FamilySyncStats:
+    """Counts of the rows written by a sync."""
+
+    members_inserted: int = 0
+    members_updated: int = 0
+    members_deleted: int = 0
+    relations_inserted: int = 0
+    relations_deleted: int = 0
+
+    @property
+    def is_empty(self) -> bool:
+        return not (
+            self.members_inserted
+            or self.members_updated
+            or self.members_deleted
+            or self.relations_inserted
+            or self.relations_deleted
+        )
+
+    def summary(self) -> str:
+        return (
+            f"members +{self.members_inserted} "
+            f"~{self.members_updated} -{self.members_deleted}, "
+            f"relations +{self.relations_inserted} -{self.relations_deleted}"
+        )
+
+
+_staging_metadata = MetaData()
+
+# Shadow tables, created per sync in the TEMP schema. Their primary keys index
+# the apply's lookups.
+_staged_members = Table(
+    "ingest_members",
+    _staging_metadata,
+    Column("id", String(100), primary_key=True),
+    *(Column(name, FamilyMember.__table__.c[name].type) for name in MEMBER_FIELDS),
+    prefixes=["TEMPORARY"],
+)
+_staged_relations = Table(
+    "ingest_relations",
+    _staging_metadata,
+    Column("from_member_id", String(100), primary_key=True),
+    Column("to_member_id", String(100), primary_key=True),
+    Column("relation_type", Relation.__table__.c.relation_type.type, primary_key=True),
+    prefixes=["TEMPORARY"],
+)
+
+
+def batched(iterable: Iterable, size: int) -> Iterator[list]:
+    """Yields lists of up to `size` consecutive items."""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+async def _drop_staging_tables(db: AsyncSession) -> None:
+    for table in (_staged_relations, _staged_members):
+        await db.execute(DropTable(table, if_exists=True))
+
+
+async def _stage_records(db: AsyncSession, records: Iterable[MemberRecord]) -> int:
+    """
+    Loads the records into the (re)created shadow tables through
+    `family_service.bulk_insert_family_data`.
+
+    Members are written batch by batch as they stream in. Their relations are
+    held back until the stream ends, since either endpoint may only appear
+    later, and are then checked against the IDs seen in memory, so only
+    relations between two distinct staged members reach the shadow table.
+
+    Returns:
+        The number of records skipped because their ID was already seen.
+    """
+    await _drop_staging_tables(db)
+    for table in (_staged_members, _staged_relations):
+        await db.execute(CreateTable(table))
+
+    seen_ids: set[str] = set()
+    # A dict keeps the relations unique and in source order.
+    pending_relations: dict[RelationKey, None] = {}
+    duplicates = 0
+    for batch in batched(records, STAGING_BATCH_SIZE):
+        members = []
+        for record in batch:
+            if record.id in seen_ids:
+                duplicates += 1
+                continue
+            seen_ids.add(record.id)
+            members.append({"id": record.id, **record.fields})
+            pending_relations.update(dict.fromkeys(record.relations))
+        await family_service.bulk_insert_family_data(
+            db,
+            members,
+            (),
+            commit=False,
+            member_table=_staged_members,
+            relation_table=_staged_relations,
+        )
+    await family_service.bulk_insert_family_data(
+        db,
+        [],
+        pending_relations,
+        existing_member_ids=seen_ids,
+        commit=False,
+        member_table=_staged_members,
+        relation_table=_staged_relations,
+    )
+    return duplicates
+
+
+async def _apply_staged_changes(
+    db: AsyncSession, stats: FamilySyncStats, now: datetime
+) -> None:
+    """Makes the live tables match the shadow tables with set-based statements."""
+    members = FamilyMember.__table__
+    relations = Relation.__table__
+    staged, staged_relations = _staged_members, _staged_relations
+
+    staged_member_ids = select(staged.c.id)
+    same_relation = (
+        (staged_relations.c.from_member_id == relations.c.from_member_id)
+        & (staged_relations.c.to_member_id == relations.c.to_member_id)
+        & (staged_relations.c.relation_type == relations.c.relation_type)
+    )
+    result = await db.execute(delete(relations).where(~exists().where(same_relation)))
+    stats.relations_deleted = result.rowcount
+
+    result = await db.execute(
+        delete(members).where(members.c.id.not_in(staged_member_ids))
+    )
+    stats.members_deleted = result.rowcount
+
+    result = await db.execute(
+        update(members)
+        .where(
+            members.c.id == staged.c.id,
+            or_(
+                *(
+                    members.c[name].is_distinct_from(staged.c[name])
+                    for name in MEMBER_FIELDS
+                )
+            ),
+        )
+        .values({**{name: staged.c[name] for name in MEMBER_FIELDS}, "updated_at": now})
+    )
+    stats.members_updated = result.rowcount
+
+    result = await db.execute(
+        insert(members).from_select(
+            ["id", *MEMBER_FIELDS, "created_at", "updated_at"],
+            select(
+                staged.c.id,
+                *(staged.c[name] for name in MEMBER_FIELDS),
+                literal(now, DateTime),
+                literal(now, DateTime),
+            ).where(staged.c.id.not_in(select(members.c.id))),
+        )
+    )
+    stats.members_inserted = result.rowcount
+
+    result = await db.execute(
+        insert(relations).from_select(
+            [
+                "from_member_id",
+                "to_member_id",
+                "relation_type",
+                "created_at",
+                "updated_at",
+            ],
+            select(
+                staged_relations.c.from_member_id,
+                staged_relations.c.to_member_id,
+                staged_relations.c.relation_type,
+                literal(now, DateTime),
+                literal(now, DateTime),
+            ).where(~exists().where(same_relation)),
+        )
+    )
+    stats.relations_inserted = result.rowcount
+
+
+def compute_content_hash(content: str) -> str:
+    """Returns the SHA-256 hex digest of a source export."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+async def get_applied_content_hash(db: AsyncSession, source: str) -> str | None:
+    """
+    Returns the hash of the last export from `source` that was applied, if any.
+
+    Args:
+        db: The asynchronous database session.
+        source: The data source name, e.g. "google_sheet".
+
+    Returns:
+        The stored content hash, or None if nothing was applied yet.
+    """
+    state = await db.get(IngestState, source)
+    return state.content_hash if state is not None else None
+
+
+async def _record_content_hash(
+    db: AsyncSession, source: str, content_hash: str
+) -> None:
+    state = await db.get(IngestState, source)
+    if state is None:
+        db.add(IngestState(source=source, content_hash=content_hash))
+    else:
+        state.content_hash = content_hash
+
+
+async def sync_family_records(
+    db: AsyncSession,
+    records: Iterable[MemberRecord],
+    source: str | None = None,
+    content_hash: str | None = None,
+) -> FamilySyncStats:
+    """
+    Makes the stored family data match a stream of records, writing only
+    what changed.
+
+    Records with an ID seen earlier in the stream are skipped, and relations
+    whose endpoints never appear (or point at themselves) are dropped. If
+    `source` and `content_hash` are given, the hash is recorded in the same
+    transaction as the changes, so it always describes what is stored.
+
+    Args:
+        db: The asynchronous database session.
+        records: Every member of the source; may be a generator.
+        source: Name of the data source the records come from.
+        content_hash: Hash of the export the records were parsed from.
+
+    Returns:
+        FamilySyncStats describing the writes (empty if nothing changed).
+
+    Raises:
+        Exception: Any database error; the transaction is rolled back.
+    """
+    stats = FamilySyncStats()
+    now = datetime.utcnow()
+    try:
+        duplicates = await _stage_records(db, records)
+        if duplicates:
+            logger.warning(f"Skipped {duplicates} duplicate member ids.")
+
+        await _apply_staged_changes(db, stats, now)
+
+        if source is not None and content_hash is not None:
+            await _record_content_hash(db, source, content_hash)
+        # Dropped in the same transaction; a rollback discards them as well.
+        await _drop_staging_tables(db)
+        await db.commit()
+
+        if stats.is_empty:
+            logger.info("Family data unchanged; nothing written.")
+        else:
+            bump_graph_version("family data synced")
+            logger.info(f"Family data changes applied: {stats.summary()}.")
+        return stats
+    except Exception:
+        await db.rollback()
+        logger.exception("Failed to sync family data.")
+        raise
@@ -0,0 +1,238 @@
+"""
+In-memory prefix index over member names, used for typeahead suggestions.
+
+Every member contributes a handful of normalized keys (each word suffix of
+"first last", plus "last first") to one sorted list of `(key, member_id)`
+pairs. A prefix lookup is then a binary search followed by a short forward
+scan, so answering a keystroke never touches the database. Member writes made
+through this process update the index in place; anything else (a rebuild by
+another process, a missed update) is caught through the graph version and
+triggers a full rebuild on the next lookup.
+"""
+
+import asyncio
+import bisect
+import logging
+import re
+from collections.abc import Iterable
+from datetime import date
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import FamilyMember
+from app.schemas.family import FamilyMemberSuggestion
+from app.services.graph_version import get_graph_version, sync_graph_version
+from app.services.search_service import normalize_search_text
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def normalize_name_prefix(value: str) -> str:
+    """Lowercases, folds 'ё' into 'е' and collapses punctuation/whitespace to single spaces."""
+    return " ".join(_WORD_RE.findall(normalize_search_text(value)))
+
+
+def _display_name(first_name: str, last_name: str | None) -> str:
+    return f"{first_name} {last_name}" if last_name else first_name
+
+
+def _name_keys(first_name: str, last_name: str | None) -> set[str]:
+    """Returns the keys a member can be found by: every word suffix of the full name."""
+    keys = set()
+    first_words = _WORD_RE.findall(normalize_search_text(first_name or ""))
+    last_words = _WORD_RE.findall(normalize_search_text(last_name or ""))
+    for words in (first_words + last_words, last_words + first_words):
+        for start in range(len(words)):
+            keys.add(" ".join(words[start:]))
+    return keys
+
+
+class NamePrefixIndex:
+    """Sorted `(key, member_id)` pairs plus the suggestion shown for each member."""
+
+    __slots__ = ("version", "_entries", "_keys_by_member", "_suggestions")
+
+    def __init__(self):
+        # Graph version the index reflects; -1 until the first build.
+        self.version = -1
+        self._entries: list[tuple[str, str]] = []
+        self._keys_by_member: dict[str, set[str]] = {}
+        self._suggestions: dict[str, FamilyMemberSuggestion] = {}
+
+    def __len__(self) -> int:
+        return len(self._suggestions)
+
+    def rebuild(
+        self,
+        members: Iterable[tuple[str, str, str | None, date | None]],
+        version: int,
+    ) -> None:
+        """
+        Replaces the whole index.
+
+        Args:
+            members: `(id, first_name, last_name, birth_date)` tuples.
+            version: The graph version the members were loaded at.
+        """
+        entries = []
+        keys_by_member = {}
+        suggestions = {}
+        for member_id, first_name, last_name, birth_date in members:
+            keys = _name_keys(first_name, last_name)
+            keys_by_member[member_id] = keys
+            suggestions[member_id] = FamilyMemberSuggestion(
+                id=member_id,
+                name=_display_name(first_name, last_name),
+                birth_date=birth_date,
+            )
+            entries.extend((key, member_id) for key in keys)
+        entries.sort()
+        self._entries = entries
+        self._keys_by_member = keys_by_member
+        self._suggestions = suggestions
+        self.version = version
+
+    def upsert(
+        self,
+        member_id: str,
+        first_name: str,
+        last_name: str | None,
+        birth_date: date | None,
+    ) -> None:
+        """Adds a member or replaces its names."""
+        self.remove(member_id)
+        keys = _name_keys(first_name, last_name)
+        for key in keys:
+            bisect.insort(self._entries, (key, member_id))
+        self._keys_by_member[member_id] = keys
+        self._suggestions[member_id] = FamilyMemberSuggestion(
+            id=member_id,
+            name=_display_name(first_name, last_name),
+            birth_date=birth_date,
+        )
+
+    def remove(self, member_id: str) -> None:
+        """Removes a member; unknown IDs are ignored."""
+        for key in self._keys_by_member.pop(member_id, ()):
+            position = bisect.bisect_left(self._entries, (key, member_id))
+            if position < len(self._entries) and self._entries[position] == (
+                key,
+                member_id,
+            ):
+                del self._entries[position]
+        self._suggestions.pop(member_id, None)
+
+    def suggest(self, query: str, limit: int) -> list[FamilyMemberSuggestion]:
+        """
+        Returns members with a name key starting with `query`, in alphabetical
+        key order. Multi-word queries match across first and last names in
+        either order, with only the last word typed partially: 'иван пет' and
+        'петров ив' both find 'Иван Петров'.
+        """
+        prefix = normalize_name_prefix(query)
+        if not prefix:
+            return []
+        entries = self._entries
+        position = bisect.bisect_left(entries, (prefix,))
+        seen = set()
+        results = []
+        while position < len(entries) and len(results) < limit:
+            key, member_id = entries[position]
+            if not key.startswith(prefix):
+                break
+            if member_id not in seen:
+                seen.add(member_id)
+                results.append(self._suggestions[member_id])
+            position += 1
+        return results
+
+
+_index = NamePrefixIndex()
+_build_lock = asyncio.Lock()
+
+
+async def _ensure_current(db: AsyncSession) -> NamePrefixIndex:
+    """Rebuilds the index from the database if it is behind the graph version."""
+    if _index.version == await sync_graph_version(db):
+        return _index
+
+    async with _build_lock:
+        if _index.version == get_graph_version():
+            return _index
+        version = await sync_graph_version(db)
+        logger.info(f"Building member name index for graph version {version}.")
+        stmt = select(
+            FamilyMember.id,
+            FamilyMember.first_name,
+            FamilyMember.last_name,
+            FamilyMember.birth_date,
+        )
+        rows = (await db.execute(stmt)).all()
+        _index.rebuild(rows, version)
+        logger.info(f"Member name index built with {len(_index)} members.")
+    return _index
+
+
+async def suggest_family_members(
+    db: AsyncSession, query: str, limit: int = 10
+) -> list[FamilyMemberSuggestion]:
+    """
+    Suggests members whose first or last name starts with the typed text.
+
+    Args:
+        db: The asynchronous database session (used only to build the index
+            and for the periodic check for writes by other processes).
+        query: The text typed so far.
+        limit: Maximum number of suggestions.
+
+    Returns:
+        Matching members in alphabetical order.
+    """
+    index = await _ensure_current(db)
+    return index.suggest(query, limit)
+
+
+def _follows(version: int) -> bool:
+    """Checks whether a write at `version` directly follows the indexed version."""
+    return _index.version != -1 and _index.version == version - 1
+
+
+def apply_member_upsert(
+    version: int,
+    member_id: str,
+    first_name: str,
+    last_name: str | None,
+    birth_date: date | None,
+) -> None:
+    """
+    Applies a committed member create/update to the index.
+
+    Args:
+        version: The graph version returned by `bump_graph_version` for the write.
+        member_id: The member ID.
+        first_name: The member's first name.
+        last_name: The member's last name.
+        birth_date: The member's birth date.
+    """
+    # If the index missed an earlier write it is left stale and rebuilt on the
+    # next lookup; patching it would hide the missing change.
+    if _follows(version):
+        _index.upsert(member_id, first_name, last_name, birth_date)
+        _index.version = version
+
+
+def apply_member_removal(version: int, member_ids: Iterable[str]) -> None:
+    """Applies committed member deletions to the index (see `apply_member_upsert`)."""
+    if _follows(version):
+        for member_id in member_ids:
+            _index.remove(member_id)
+        _index.version = version
+
+
+def apply_relation_change(version: int) -> None:
+    """Records a committed relationship write, which leaves names unchanged."""
+    if _follows(version):
+        _index.version = version
@@ -1,8 +1,12 @@
 import logging
 import os
 import smtplib
+import threading
+import time
 from email.mime.text import MIMEText
+from urllib.parse import urlencode
 
+from app.services.subscription_service import unsubscribe_token
 from config import config  # Import the config dictionary
 
 logger = logging.getLogger(__name__)
@@ -21,13 +25,24 @@ def _get_russian_years_string(age: int) -> str:
         return "лет"
 
 
-def format_birthday_email(name: str, age: int) -> tuple[str, str]:
+def build_unsubscribe_url(email: str, app_config) -> str:
+    """Returns the signed link that unsubscribes `email` from notifications."""
+    query = urlencode(
+        {"email": email, "token": unsubscribe_token(email, app_config.JWT_SECRET_KEY)}
+    )
+    return f"{app_config.PUBLIC_API_URL}/unsubscribe?{query}"
+
+
+def format_birthday_email(
+    name: str, age: int, unsubscribe_url: str | None = None
+) -> tuple[str, str]:
     """
     Formats the birthday notification email subject and body in Russian.
 
     Args:
         name: The name of the person celebrating their birthday.
         age: The age the person is turning.
+        unsubscribe_url: The recipient's unsubscribe link, added as a footer.
 
     Returns:
         A tuple containing the email subject and body.
@@ -42,73 +57,234 @@ def format_birthday_email(name: str, age: int) -> tuple[str, str]:
         f"С наилучшими пожеланиями,\n"
         f"Ваше Семейное Древо"
     )
+    if unsubscribe_url:
+        body += (
+            f"\n\n--\nЧтобы отписаться от уведомлений, перейдите по ссылке: "
+            f"{unsubscribe_url}"
+        )
     logger.debug(f"Formatted email - Subject: {subject}")
     return subject, body
 
 
-def send_email(subject: str, body: str, recipients: list[str], app_config=None) -> bool:
-    """
-    Sends an email using SMTP configuration.
+# Seconds to wait for the SMTP server to connect or answer a command.
+SMTP_TIMEOUT_SECONDS = 10
+# A connection idle for longer than this is checked with NOOP before reuse.
+SMTP_IDLE_CHECK_SECONDS = 30
 
-    Args:
-        subject: The email subject.
-        body: The email body (plain text).
-        recipients: A list of recipient email addresses.
-        app_config: The application configuration object. If None, loads default config.
 
-    Returns:
-        True if the email was sent successfully to all recipients, False otherwise.
+def build_email(
+    subject: str,
+    body: str,
+    sender: str,
+    recipients: list[str],
+    unsubscribe_url: str | None = None,
+) -> MIMEText:
+    """
+    Builds a plain-text UTF-8 message, with List-Unsubscribe headers (RFC 2369,
+    RFC 8058 one-click) if an unsubscribe link is given.
     """
-    if app_config is None:
-        config_name = os.getenv("APP_ENV", "development")
-        app_config = config[config_name]
-        logger.info(f"Loaded '{config_name}' configuration for email sending.")
-
-    if not app_config.MAIL_SERVER:
-        logger.error("Mail server not configured. Cannot send email.")
-        return False
-
-    sender = app_config.MAIL_DEFAULT_SENDER
     msg = MIMEText(body, "plain", "utf-8")
     msg["Subject"] = subject
     msg["From"] = sender
     msg["To"] = ", ".join(recipients)
+    if unsubscribe_url:
+        msg["List-Unsubscribe"] = f"<{unsubscribe_url}>"
+        msg["List-Unsubscribe-Post"] = "List-Unsubscribe=One-Click"
+    return msg
+
+
+class SmtpSender:
+    """
+    Sends emails over one authenticated SMTP connection that is kept open
+    between messages.
+
+    The connection is opened (with STARTTLS and login as configured) on the
+    first message and reused for the following ones, so a batch of messages
+    costs a single TLS handshake and login. A connection that has been idle
+    for a while is checked with NOOP before reuse, and one the server has
+    dropped is re-established and the message retried once. Use it as a
+    context manager, or call `close()`, to end the session.
+
+    The connection is used by one thread at a time.
+    """
 
-    logger.info(f"Attempting to send email. Subject: '{subject}', To: {recipients}")
+    def __init__(self, app_config=None):
+        """
+        Args:
+            app_config: The application configuration object. If None, loads
+                default config.
+        """
+        if app_config is None:
+            config_name = os.getenv("APP_ENV", "development")
+            app_config = config[config_name]
+            logger.info(f"Loaded '{config_name}' configuration for email sending.")
+        self.app_config = app_config
+        self._server: smtplib.SMTP | None = None
+        self._last_used = 0.0
+        self._lock = threading.Lock()
 
-    try:
+    def __enter__(self) -> "SmtpSender":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _connect(self) -> smtplib.SMTP:
+        app_config = self.app_config
         if app_config.MAIL_PORT == 465:
-            server = smtplib.SMTP_SSL(
-                app_config.MAIL_SERVER, app_config.MAIL_PORT, timeout=10
-            )
             logger.debug(
                 f"Connecting via SMTP_SSL to {app_config.MAIL_SERVER}:{app_config.MAIL_PORT}"
             )
-        else:
-            server = smtplib.SMTP(
-                app_config.MAIL_SERVER, app_config.MAIL_PORT, timeout=10
+            server = smtplib.SMTP_SSL(
+                app_config.MAIL_SERVER,
+                app_config.MAIL_PORT,
+                timeout=SMTP_TIMEOUT_SECONDS,
             )
+        else:
             logger.debug(
                 f"Connecting via SMTP to {app_config.MAIL_SERVER}:{app_config.MAIL_PORT}"
             )
-            if app_config.MAIL_USE_TLS:
+            server = smtplib.SMTP(
+                app_config.MAIL_SERVER,
+                app_config.MAIL_PORT,
+                timeout=SMTP_TIMEOUT_SECONDS,
+            )
+        try:
+            if app_config.MAIL_PORT != 465 and app_config.MAIL_USE_TLS:
                 logger.debug("Starting TLS...")
                 server.starttls()
                 logger.debug("TLS started.")
+            if app_config.MAIL_USERNAME and app_config.MAIL_PASSWORD:
+                logger.debug(f"Logging in as {app_config.MAIL_USERNAME}...")
+                server.login(app_config.MAIL_USERNAME, app_config.MAIL_PASSWORD)
+                logger.debug("Login successful.")
+        except BaseException:
+            server.close()
+            raise
+        logger.info(f"SMTP session opened with {app_config.MAIL_SERVER}.")
+        return server
+
+    def _drop(self) -> None:
+        """Discards the connection without the QUIT exchange."""
+        if self._server is not None:
+            try:
+                self._server.close()
+            except OSError:
+                pass
+            self._server = None
+
+    def _connection(self) -> smtplib.SMTP:
+        """Returns a live connection, reusing the open one if it still works."""
+        if (
+            self._server is not None
+            and time.monotonic() - self._last_used > SMTP_IDLE_CHECK_SECONDS
+        ):
+            try:
+                if self._server.noop()[0] != 250:
+                    self._drop()
+            except (smtplib.SMTPException, OSError):
+                self._drop()
+        if self._server is None:
+            self._server = self._connect()
+        return self._server
+
+    def send_message(self, msg: MIMEText, recipients: list[str]) -> dict:
+        """
+        Sends a message, reconnecting once if the server dropped the connection.
+
+        Args:
+            msg: The message to send.
+            recipients: The envelope recipient addresses.
 
-        if app_config.MAIL_USERNAME and app_config.MAIL_PASSWORD:
-            logger.debug(f"Logging in as {app_config.MAIL_USERNAME}...")
-            server.login(app_config.MAIL_USERNAME, app_config.MAIL_PASSWORD)
-            logger.debug("Login successful.")
+        Returns:
+            The recipients the server refused, as `smtplib.SMTP.sendmail` does.
 
-        logger.debug("Sending email...")
-        server.sendmail(sender, recipients, msg.as_string())
+        Raises:
+            smtplib.SMTPException, OSError: If the message could not be sent.
+        """
+        with self._lock:
+            for attempt in (1, 2):
+                server = self._connection()
+                try:
+                    refused = server.sendmail(
+                        self.app_config.MAIL_DEFAULT_SENDER,
+                        recipients,
+                        msg.as_string(),
+                    )
+                except (
+                    smtplib.SMTPServerDisconnected,
+                    ConnectionError,
+                    TimeoutError,
+                ) as e:
+                    self._drop()
+                    if attempt == 2:
+                        raise
+                    logger.warning(f"SMTP connection lost ({e}), reconnecting.")
+                    continue
+                self._last_used = time.monotonic()
+                return refused
+
+    def send(self, subject: str, body: str, recipients: list[str]) -> bool:
+        """
+        Sends a plain-text email to all recipients.
+
+        Args:
+            subject: The email subject.
+            body: The email body (plain text).
+            recipients: A list of recipient email addresses.
+
+        Returns:
+            True if the email was sent successfully to all recipients, False otherwise.
+        """
+        if not self.app_config.MAIL_SERVER:
+            logger.error("Mail server not configured. Cannot send email.")
+            return False
+
+        msg = build_email(
+            subject, body, self.app_config.MAIL_DEFAULT_SENDER, recipients
+        )
+        logger.info(f"Attempting to send email. Subject: '{subject}', To: {recipients}")
+        try:
+            refused = self.send_message(msg, recipients)
+        except smtplib.SMTPException as e:
+            logger.error(f"SMTP Error sending email: {e}", exc_info=True)
+            return False
+        except Exception as e:
+            logger.error(f"Failed to send email: {e}", exc_info=True)
+            return False
+        if refused:
+            logger.error(f"Email refused for {sorted(refused)}.")
+            return False
         logger.info(f"Email sent successfully to {recipients}.")
-        server.quit()
         return True
-    except smtplib.SMTPException as e:
-        logger.error(f"SMTP Error sending email: {e}", exc_info=True)
-        return False
-    except Exception as e:
-        logger.error(f"Failed to send email: {e}", exc_info=True)
-        return False
+
+    def close(self) -> None:
+        """Ends the SMTP session, if one is open."""
+        with self._lock:
+            if self._server is None:
+                return
+            try:
+                self._server.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._drop()
+            logger.info("SMTP session closed.")
+
+
+def send_email(subject: str, body: str, recipients: list[str], app_config=None) -> bool:
+    """
+    Sends a single email over a connection of its own.
+
+    Use SmtpSender to send several emails over one connection.
+
+    Args:
+        subject: The email subject.
+        body: The email body (plain text).
+        recipients: A list of recipient email addresses.
+        app_config: The application configuration object. If None, loads default config.
+
+    Returns:
+        True if the email was sent successfully to all recipients, False otherwise.
+    """
+    with SmtpSender(app_config) as sender:
+        return sender.send(subject, body, recipients)
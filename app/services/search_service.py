@@ -0,0 +1,197 @@
+import logging
+import re
+
+from sqlalchemy import and_, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import FamilyMember
+from app.schemas.family import FamilyMemberSearchResult
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "family_members_fts"
+
+# Column weights for bm25(): first_name, last_name, location, notes.
+_BM25_WEIGHTS = "10.0, 10.0, 2.0, 1.0"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+_fts_available: bool | None = None
+
+
+def normalize_search_text(value: str) -> str:
+    """Lowercases text and folds 'ё' into 'е', matching how the index is built."""
+    return value.lower().replace("ё", "е")
+
+
+def build_fts_query(search_term: str) -> str | None:
+    """
+    Turns free text into an FTS5 MATCH expression where every word must match
+    as a prefix, e.g. 'Иван Пет' -> '"иван"* "пет"*'. Returns None if the text
+    contains no words.
+    """
+    tokens = _TOKEN_RE.findall(normalize_search_text(search_term))
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+async def is_fts_available(db: AsyncSession) -> bool:
+    """Checks (once per process) whether the FTS5 member index exists."""
+    global _fts_available
+    if _fts_available is None:
+        if db.bind.dialect.name != "sqlite":
+            _fts_available = False
+        else:
+            result = await db.execute(
+                text(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"
+                ),
+                {"name": FTS_TABLE},
+            )
+            _fts_available = result.scalar_one_or_none() is not None
+        if not _fts_available:
+            logger.warning(
+                "Full-text member index not available; falling back to column filters."
+            )
+    return _fts_available
+
+
+def _fallback_filter(search_term: str):
+    """Prefix/substring filter over the indexed columns, used without FTS5."""
+    tokens = _TOKEN_RE.findall(search_term)
+    clauses = []
+    for token in tokens:
+        pattern = f"%{token}%"
+        clauses.append(
+            or_(
+                FamilyMember.first_name.ilike(pattern),
+                FamilyMember.last_name.ilike(pattern),
+                FamilyMember.location.ilike(pattern),
+                FamilyMember.notes.ilike(pattern),
+            )
+        )
+    return and_(*clauses) if clauses else None
+
+
+async def member_search_filter(db: AsyncSession, search_term: str):
+    """
+    Returns a WHERE clause selecting members that match `search_term`, backed by
+    the FTS5 index when available. Returns None if the term has no words.
+    """
+    if await is_fts_available(db):
+        fts_query = build_fts_query(search_term)
+        if fts_query is None:
+            return None
+        return text(
+            f"family_members.rowid IN (SELECT rowid FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH :fts_query)"
+        ).bindparams(fts_query=fts_query)
+    return _fallback_filter(search_term)
+
+
+def _search_result_from_row(row, score: float) -> FamilyMemberSearchResult:
+    name = (
+        f"{row['first_name']} {row['last_name']}"
+        if row["last_name"]
+        else row["first_name"]
+    )
+    return FamilyMemberSearchResult(
+        id=row["id"],
+        first_name=row["first_name"],
+        last_name=row["last_name"],
+        birth_date=row["birth_date"],
+        death_date=row["death_date"],
+        gender=row["gender"],
+        location=row["location"],
+        notes=row["notes"],
+        name=name,
+        score=score,
+    )
+
+
+async def search_family_members(
+    db: AsyncSession, search_term: str, limit: int = 20
+) -> list[FamilyMemberSearchResult]:
+    """
+    Searches members by first name, last name, location and notes.
+
+    With the FTS5 index, matching is case-insensitive (including Cyrillic),
+    treats 'ё' and 'е' alike, matches word prefixes and ranks results by bm25
+    with names weighted above location and notes.
+
+    Args:
+        db: The asynchronous database session.
+        search_term: Free-text query.
+        limit: Maximum number of results.
+
+    Returns:
+        Matching members, best match first.
+    """
+    logger.info(f"Searching family members for '{search_term}' (limit={limit}).")
+
+    if await is_fts_available(db):
+        fts_query = build_fts_query(search_term)
+        if fts_query is None:
+            return []
+        stmt = text(
+            f"SELECT m.id, m.first_name, m.last_name, m.birth_date, m.death_date, "
+            f"m.gender, m.location, m.notes, bm25({FTS_TABLE}, {_BM25_WEIGHTS}) AS score "
+            f"FROM {FTS_TABLE} JOIN family_members AS m ON m.rowid = {FTS_TABLE}.rowid "
+            f"WHERE {FTS_TABLE} MATCH :fts_query "
+            f"ORDER BY score LIMIT :limit"
+        ).columns(
+            FamilyMember.id,
+            FamilyMember.first_name,
+            FamilyMember.last_name,
+            FamilyMember.birth_date,
+            FamilyMember.death_date,
+            FamilyMember.gender,
+            FamilyMember.location,
+            FamilyMember.notes,
+        )
+        rows = (
+            (await db.execute(stmt, {"fts_query": fts_query, "limit": limit}))
+            .mappings()
+            .all()
+        )
+        results = [_search_result_from_row(row, score=-row["score"]) for row in rows]
+    else:
+        search_filter = _fallback_filter(search_term)
+        if search_filter is None:
+            return []
+        stmt = (
+            select(*FamilyMember.__table__.columns)
+            .where(search_filter)
+            .order_by(FamilyMember.last_name, FamilyMember.first_name)
+            .limit(limit)
+        )
+        rows = (await db.execute(stmt)).mappings().all()
+        results = [_search_result_from_row(row, score=0.0) for row in rows]
+
+    logger.info(f"Found {len(results)} members matching '{search_term}'.")
+    return results
+
+
+async def rebuild_search_index(db: AsyncSession) -> None:
+    """
+    Repopulates the FTS5 index from family_members. The triggers keep it in
+    sync during normal writes; this is only needed if rowids were renumbered
+    (e.g. by VACUUM) or the index was created over existing data.
+    """
+    if not await is_fts_available(db):
+        return
+    await db.execute(text(f"DELETE FROM {FTS_TABLE}"))
+    await db.execute(
+        text(
+            f"INSERT INTO {FTS_TABLE}(rowid, first_name, last_name, location, notes) "
+            "SELECT rowid, "
+            "replace(replace(first_name, 'ё', 'е'), 'Ё', 'Е'), "
+            "replace(replace(last_name, 'ё', 'е'), 'Ё', 'Е'), "
+            "replace(replace(location, 'ё', 'е'), 'Ё', 'Е'), "
+            "replace(replace(notes, 'ё', 'е'), 'Ё', 'Е') "
+            "FROM family_members"
+        )
+    )
+    await db.commit()
+    logger.info("Rebuilt full-text member search index.")
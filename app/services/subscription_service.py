@@ -1,14 +1,23 @@
+import base64
+import hashlib
+import hmac
 import logging
+import os
+from datetime import datetime
 
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import SubscribedEmail
 from app.schemas.subscription import SubscriptionCreate
+from config import config
 
 logger = logging.getLogger(__name__)
 
+config_name = os.getenv("APP_ENV", "development")
+app_config = config[config_name]
+
 
 class SubscriptionError(Exception):
     """Custom exception for subscription errors."""
@@ -22,6 +31,40 @@ class EmailAlreadyExistsError(SubscriptionError):
     pass
 
 
+class SubscriptionNotFoundError(SubscriptionError):
+    """Exception raised when an email was never subscribed."""
+
+    pass
+
+
+def unsubscribe_token(email: str, secret: str | None = None) -> str:
+    """
+    Returns the token that authorizes unsubscribing `email`.
+
+    The token is an HMAC of the address, so unsubscribe links need no stored
+    state and cannot be forged for other addresses.
+
+    Args:
+        email: The subscribed email address (case-insensitive).
+        secret: The signing key; defaults to JWT_SECRET_KEY.
+
+    Raises:
+        SubscriptionError: If no signing key is configured.
+    """
+    secret = secret or app_config.JWT_SECRET_KEY
+    if not secret:
+        raise SubscriptionError("JWT_SECRET_KEY is not set; cannot sign links.")
+    digest = hmac.new(
+        secret.encode(), f"unsubscribe:{email.lower()}".encode(), hashlib.sha256
+    ).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+def verify_unsubscribe_token(email: str, token: str, secret: str | None = None) -> bool:
+    """True if `token` authorizes unsubscribing `email`."""
+    return hmac.compare_digest(unsubscribe_token(email, secret), token)
+
+
 async def add_subscription(
     db: AsyncSession, subscription_data: SubscriptionCreate
 ) -> SubscribedEmail:
@@ -53,7 +96,7 @@ async def add_subscription(
         raise EmailAlreadyExistsError(f"Email {email_lower} is already subscribed.")
 
     stmt_inactive_check = select(SubscribedEmail).where(
-        (SubscribedEmail.email == email_lower) & (not SubscribedEmail.is_active)
+        (SubscribedEmail.email == email_lower) & ~SubscribedEmail.is_active
     )
     result_inactive_check = await db.execute(stmt_inactive_check)
     inactive_subscription = result_inactive_check.scalar_one_or_none()
@@ -61,7 +104,7 @@ async def add_subscription(
     if inactive_subscription:
         logger.info(f"Reactivating existing inactive subscription for {email_lower}.")
         inactive_subscription.is_active = True
-        inactive_subscription.last_updated = func.utcnow()
+        inactive_subscription.last_updated = datetime.utcnow()
         try:
             await db.commit()
             await db.refresh(inactive_subscription)
@@ -114,3 +157,52 @@ async def add_subscription(
         raise SubscriptionError(
             f"Failed to create subscription for {email_lower}."
         ) from e
+
+
+async def remove_subscription(db: AsyncSession, email: str) -> SubscribedEmail:
+    """
+    Deactivates the subscription of an email address.
+
+    Unsubscribing an address that is already inactive succeeds, so repeated
+    clicks on an unsubscribe link are harmless.
+
+    Args:
+        db: The asynchronous database session.
+        email: The email address to unsubscribe.
+
+    Returns:
+        The deactivated SubscribedEmail ORM instance.
+
+    Raises:
+        SubscriptionNotFoundError: If the email was never subscribed.
+        SubscriptionError: For database errors during the update.
+    """
+    email_lower = email.lower()
+    logger.info(f"Attempting to remove subscription for email: {email_lower}")
+
+    result = await db.execute(
+        select(SubscribedEmail).where(SubscribedEmail.email == email_lower)
+    )
+    subscription = result.scalar_one_or_none()
+    if subscription is None:
+        logger.warning(f"No subscription found for {email_lower}.")
+        raise SubscriptionNotFoundError(f"Email {email_lower} is not subscribed.")
+    if not subscription.is_active:
+        logger.info(f"Subscription for {email_lower} is already inactive.")
+        return subscription
+
+    subscription.is_active = False
+    subscription.last_updated = datetime.utcnow()
+    try:
+        await db.commit()
+        await db.refresh(subscription)
+        logger.info(f"Successfully removed subscription for {email_lower}.")
+        return subscription
+    except Exception as e:
+        await db.rollback()
+        logger.exception(
+            f"Database error removing subscription for {email_lower}.", exc_info=True
+        )
+        raise SubscriptionError(
+            f"Failed to remove subscription for {email_lower}."
+        ) from e
@@ -0,0 +1,158 @@
+import asyncio
+import logging
+import os
+from dataclasses import dataclass, field
+
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas.family import FamilyMemberRead
+from app.services import family_service
+from app.services.family_graph import DescendantClosure, FamilyGraph
+from app.services.graph_version import get_graph_version, sync_graph_version
+from app.utils.http_cache import PreEncodedBody
+from config import config
+
+logger = logging.getLogger(__name__)
+
+config_name = os.getenv("APP_ENV", "development")
+app_config = config[config_name]
+
+
+@dataclass
+class FamilyTreeSnapshot:
+    """In-memory view of the full family tree as served by `/api/family/tree`."""
+
+    version: int
+    members: list[FamilyMemberRead]
+    graph: FamilyGraph
+    closure: DescendantClosure
+    encoded: PreEncodedBody
+    root_bodies: dict[str, PreEncodedBody] = field(default_factory=dict)
+
+
+# Bodies for `?root=` requests are cached per snapshot, up to this many roots.
+MAX_CACHED_ROOT_BODIES = 32
+
+_members_adapter = TypeAdapter(list[FamilyMemberRead])
+_snapshot: FamilyTreeSnapshot | None = None
+_build_lock = asyncio.Lock()
+
+
+async def get_family_tree_snapshot(db: AsyncSession) -> FamilyTreeSnapshot:
+    """
+    Returns the in-memory family tree snapshot, rebuilding it if the graph changed.
+
+    Args:
+        db: The asynchronous database session (used only on a cache miss or
+            a periodic stamp check, see `sync_graph_version`).
+
+    Returns:
+        The current FamilyTreeSnapshot.
+    """
+    global _snapshot
+
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.version == await sync_graph_version(db):
+        return snapshot
+
+    async with _build_lock:
+        # Another request may have rebuilt the snapshot while we were waiting.
+        snapshot = _snapshot
+        if snapshot is not None and snapshot.version == get_graph_version():
+            return snapshot
+
+        version = await sync_graph_version(db)
+        logger.info(f"Building family tree snapshot for graph version {version}.")
+        members, graph, closure = await family_service.get_family_tree_data(
+            db, root_ids=app_config.FAMILY_TREE_ROOT_IDS
+        )
+        encoded = PreEncodedBody.from_bytes(_members_adapter.dump_json(members))
+        _snapshot = FamilyTreeSnapshot(
+            version=version,
+            members=members,
+            graph=graph,
+            closure=closure,
+            encoded=encoded,
+        )
+        logger.info(
+            f"Family tree snapshot built with {len(members)} members "
+            f"({len(encoded.identity)} bytes, ETag {encoded.etag}, version {version})."
+        )
+        return _snapshot
+
+
+def get_encoded_tree_for_root(
+    snapshot: FamilyTreeSnapshot, root_id: str
+) -> PreEncodedBody | None:
+    """
+    Returns the tree body with 'is_descendant' computed relative to a single root.
+
+    Configured roots are answered from the snapshot's precomputed closure;
+    other members fall back to one descendant walk. Either way the encoded
+    body is cached on the snapshot, so repeated requests skip both.
+
+    Args:
+        snapshot: The current tree snapshot.
+        root_id: The member ID to use as the root.
+
+    Returns:
+        The encoded body, or None if `root_id` is not a known member.
+    """
+    cached = snapshot.root_bodies.get(root_id)
+    if cached is not None:
+        return cached
+
+    root = snapshot.graph.index_of(root_id)
+    if root is None:
+        return None
+
+    position = snapshot.closure.position_of(root)
+    if position is not None:
+        flags = [
+            snapshot.closure.contains(position, i) for i in range(len(snapshot.graph))
+        ]
+    else:
+        flags = snapshot.graph.mark_descendants([root])
+
+    members = [
+        member.model_copy(update={"is_descendant": bool(flag)})
+        for member, flag in zip(snapshot.members, flags)
+    ]
+    encoded = PreEncodedBody.from_bytes(_members_adapter.dump_json(members))
+    if len(snapshot.root_bodies) < MAX_CACHED_ROOT_BODIES:
+        snapshot.root_bodies[root_id] = encoded
+    return encoded
+
+
+def get_tree_window(
+    snapshot: FamilyTreeSnapshot, member_id: str, up: int, down: int
+) -> bytes | None:
+    """
+    Serializes the members within `up` generations of ancestors and `down`
+    generations of descendants of a focus member (plus their spouses).
+
+    The cost depends only on the size of the window, not of the whole tree.
+    Relationships are returned unfiltered, so edges leading outside the window
+    tell the client where the tree can be expanded further.
+
+    Args:
+        snapshot: The current tree snapshot.
+        member_id: The focus member ID.
+        up: Number of ancestor generations to include.
+        down: Number of descendant generations to include.
+
+    Returns:
+        The JSON-encoded member list, or None if `member_id` is unknown.
+    """
+    node = snapshot.graph.index_of(member_id)
+    if node is None:
+        return None
+    window = snapshot.graph.subtree(node, up=up, down=down)
+    return _members_adapter.dump_json([snapshot.members[i] for i in window])
+
+
+def clear_family_tree_snapshot() -> None:
+    """Drops the cached snapshot so the next read rebuilds it from the database."""
+    global _snapshot
+    _snapshot = None
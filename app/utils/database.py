@@ -1,6 +1,7 @@
 import logging
 import os
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base
 
@@ -39,6 +40,16 @@ try:
         connect_args=connect_args,
     )
 
+    if DATABASE_URL.startswith("sqlite"):
+
+        @event.listens_for(async_engine.sync_engine, "connect")
+        def _enable_sqlite_wal(dbapi_connection, connection_record):
+            # With write-ahead logging, readers keep reading the last committed
+            # state while a writer (e.g. the ingest) holds the write lock.
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.close()
+
     AsyncSessionFactory = async_sessionmaker(
         bind=async_engine,
         expire_on_commit=False,
@@ -0,0 +1,128 @@
+"""
+Helpers for serving pre-serialized JSON bodies with ETag validation and
+pre-compressed (gzip/brotli) variants.
+"""
+
+import gzip
+import hashlib
+from dataclasses import dataclass
+
+from fastapi import Request, Response, status
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; gzip is always available.
+    brotli = None
+
+
+@dataclass(frozen=True)
+class PreEncodedBody:
+    """A response body encoded once, with its compressed variants and ETag."""
+
+    etag: str
+    identity: bytes
+    gzip: bytes
+    br: bytes | None
+
+    @classmethod
+    def from_bytes(cls, body: bytes) -> "PreEncodedBody":
+        """Builds the compressed variants and a strong content-hash ETag."""
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        return cls(
+            etag=f'"{digest}"',
+            identity=body,
+            gzip=gzip.compress(body, compresslevel=9, mtime=0),
+            br=brotli.compress(body) if brotli is not None else None,
+        )
+
+    def variant_etag(self, encoding: str | None) -> str:
+        """Returns the ETag of a specific content-coding of this body."""
+        if encoding is None:
+            return self.etag
+        return f'{self.etag[:-1]}-{encoding}"'
+
+
+def _accepted_encodings(accept_encoding: str) -> set[str]:
+    """Parses an Accept-Encoding header, dropping codings with q=0."""
+    accepted = set()
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        params = params.replace(" ", "")
+        if params.startswith("q="):
+            try:
+                if float(params[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding)
+    return accepted
+
+
+def _select_encoding(request: Request, body: PreEncodedBody) -> str | None:
+    accepted = _accepted_encodings(request.headers.get("accept-encoding", ""))
+    if body.br is not None and ("br" in accepted or "*" in accepted):
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+def _if_none_match_hits(request: Request, body: PreEncodedBody) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    known = {body.variant_etag(encoding) for encoding in (None, "gzip", "br")}
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        # If-None-Match uses weak comparison; proxies may have weakened our tag.
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag in known:
+            return True
+    return False
+
+
+def build_cached_response(
+    request: Request,
+    body: PreEncodedBody,
+    media_type: str = "application/json",
+) -> Response:
+    """
+    Builds a response for a pre-encoded body, honouring If-None-Match and
+    Accept-Encoding.
+
+    Args:
+        request: The incoming request.
+        body: The pre-encoded body to serve.
+        media_type: The Content-Type of the uncompressed body.
+
+    Returns:
+        A 304 response if the client already has this body, otherwise a 200
+        response carrying the best matching encoded variant.
+    """
+    encoding = _select_encoding(request, body)
+    headers = {
+        "ETag": body.variant_etag(encoding),
+        "Vary": "Accept-Encoding",
+        # Clients may cache the body but must revalidate it on every use.
+        "Cache-Control": "no-cache",
+    }
+
+    if _if_none_match_hits(request, body):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if encoding == "br":
+        content = body.br
+    elif encoding == "gzip":
+        content = body.gzip
+    else:
+        content = body.identity
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+
+    return Response(content=content, media_type=media_type, headers=headers)
@@ -16,6 +16,7 @@ translations = {
     "health_check_ok": "Сервис работает нормально.",
     # Family Tree
     "family_tree_retrieved": "Семейное древо успешно получено.",
+    "error_root_not_supported_ndjson": "Параметр root не поддерживается для потокового формата NDJSON.",
     # Birthdays
     "upcoming_birthdays_retrieved": "Предстоящие дни рождения успешно получены.",
     "no_upcoming_birthdays": "В ближайшее время дней рождения нет.",
@@ -25,6 +26,10 @@ translations = {
     "invalid_email": "Неверный формат email.",
     "unsubscribed_successfully": "Вы успешно отписались.",
     "subscription_not_found": "Подписка не найдена.",
+    "unsubscribe_link_invalid": "Недействительная ссылка для отписки.",
+    "unsubscribe_confirm_title": "Отписка от уведомлений",
+    "unsubscribe_confirm_prompt": "Отписать {email} от уведомлений о днях рождения?",
+    "unsubscribe_confirm_button": "Отписаться",
     "confirmation_email_sent": "Письмо с подтверждением отправлено на ваш email.",
     "error_sending_email": "Ошибка при отправке email.",
     # Authentication
@@ -49,6 +54,7 @@ translations = {
     "error_relation_self": "Нельзя создать связь члена семьи с самим собой.",
     "error_relation_invalid_type": "Недопустимый тип связи: {type}.",
     "error_listing_members": "Ошибка при получении списка членов семьи.",
+    "error_invalid_cursor": "Недействительный курсор пагинации.",
     # Batch Operations
     "error_batch_delete_empty_list": "Список ID для удаления не может быть пустым.",
     "success_batch_delete": "Успешно удалено {count} членов семьи.",
@@ -14,12 +14,39 @@ class Config:
     JWT_ALGORITHM = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES = int(os.environ.get("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
 
+    # How often (seconds) the cached family tree re-checks the DB for writes made
+    # by other processes, such as the scheduler's ingest job.
+    TREE_CACHE_STAMP_INTERVAL_SECONDS = int(
+        os.environ.get("TREE_CACHE_STAMP_INTERVAL_SECONDS", 30)
+    )
+
+    # Comma-separated member IDs whose descendants are flagged in the tree. When
+    # unset, the founder with the longest line of descendants is used.
+    FAMILY_TREE_ROOT_IDS = [
+        member_id.strip()
+        for member_id in os.environ.get("FAMILY_TREE_ROOT_IDS", "").split(",")
+        if member_id.strip()
+    ]
+
+    # Seconds between scheduled Google Sheets ingests. Polls are cheap when the
+    # sheet is unchanged (its content hash matches the last applied one).
+    INGEST_INTERVAL_SECONDS = int(os.environ.get("INGEST_INTERVAL_SECONDS", 600))
+
     MAIL_SERVER = os.environ.get("MAIL_SERVER")
     MAIL_PORT = int(os.environ.get("MAIL_PORT") or 587)
     MAIL_USE_TLS = os.environ.get("MAIL_USE_TLS", "true").lower() in ["true", "1", "t"]
     MAIL_USERNAME = os.environ.get("MAIL_USERNAME")
     MAIL_PASSWORD = os.environ.get("MAIL_PASSWORD")
     MAIL_DEFAULT_SENDER = os.environ.get("MAIL_DEFAULT_SENDER") or "noreply@example.com"
+    # Notification delivery: SMTP sessions used in parallel, attempts per message
+    # and the delay before the first retry (doubled for each further one).
+    MAIL_CONCURRENCY = int(os.environ.get("MAIL_CONCURRENCY", 2))
+    MAIL_MAX_ATTEMPTS = int(os.environ.get("MAIL_MAX_ATTEMPTS", 4))
+    MAIL_RETRY_BASE_SECONDS = float(os.environ.get("MAIL_RETRY_BASE_SECONDS", 5))
+    # Public URL of the API, used for the unsubscribe links in notifications.
+    PUBLIC_API_URL = os.environ.get(
+        "PUBLIC_API_URL", "http://localhost:8000/api"
+    ).rstrip("/")
 
 
 class DevelopmentConfig(Config):
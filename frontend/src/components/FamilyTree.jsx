@@ -36,7 +36,8 @@ const transformDataForCytoscape = (members) => {
       const targetId = String(relation.to_member_id);
       const sourceMember = memberMap.get(sourceId);
 
-      if (sourceMember) {
+      // Partial trees (see getFamilyTreeWindow) may reference unloaded members.
+      if (sourceMember && memberMap.has(targetId)) {
         if (!edgeIds.has(edgeId) && relation.relation_type !== "CHILD") {
           elements.push({
             data: {
@@ -2,6 +2,9 @@ import React, { useState, useEffect } from "react";
 import { useTranslation } from "react-i18next";
 import familyTreeService from "../services/familyTreeService";
 
+// Wait this long after the last keystroke before asking for suggestions.
+const SUGGEST_DEBOUNCE_MS = 150;
+
 const RelationshipItem = ({ relation, currentMemberId, onDelete, members }) => {
   const { t } = useTranslation();
   const [isDeleting, setIsDeleting] = useState(false);
@@ -88,23 +91,25 @@ const RelationshipManager = ({
   onRelationshipChange,
 }) => {
   const { t } = useTranslation();
-  const [allMembers, setAllMembers] = useState([]);
-  const [loadingMembers, setLoadingMembers] = useState(true);
+  const [relatedMembers, setRelatedMembers] = useState([]);
   const [error, setError] = useState("");
   const [message, setMessage] = useState({ type: "", text: "" });
 
   const [relatedMemberId, setRelatedMemberId] = useState("");
+  const [memberQuery, setMemberQuery] = useState("");
+  const [suggestions, setSuggestions] = useState([]);
+  const [isSuggesting, setIsSuggesting] = useState(false);
   const [relationType, setRelationType] = useState("parent");
   const [isCreating, setIsCreating] = useState(false);
 
   const allRelations = [...relationshipsFrom, ...relationshipsTo];
 
+  // Only the directly related members are needed to label existing relations.
   useEffect(() => {
-    setLoadingMembers(true);
     familyTreeService
-      .getMembersAdmin()
+      .getFamilyTreeWindow(memberId, 1, 1)
       .then((data) => {
-        setAllMembers(data.filter((m) => m.id !== memberId));
+        setRelatedMembers(data.filter((m) => m.id !== memberId));
       })
       .catch((err) => {
         console.error("Error fetching members for relationship manager:", err);
@@ -114,9 +119,48 @@ const RelationshipManager = ({
             "Failed to load members list.",
           ),
         );
-      })
-      .finally(() => setLoadingMembers(false));
-  }, [memberId, t]);
+      });
+  }, [memberId, relationshipsFrom, relationshipsTo, t]);
+
+  useEffect(() => {
+    const query = memberQuery.trim();
+    if (!query || relatedMemberId) {
+      setSuggestions([]);
+      return undefined;
+    }
+    let cancelled = false;
+    const timer = setTimeout(() => {
+      setIsSuggesting(true);
+      familyTreeService
+        .suggestMembersAdmin(query)
+        .then((data) => {
+          if (!cancelled) {
+            setSuggestions(data.filter((m) => m.id !== memberId));
+          }
+        })
+        .catch((err) => {
+          console.error("Error fetching member suggestions:", err);
+        })
+        .finally(() => {
+          if (!cancelled) setIsSuggesting(false);
+        });
+    }, SUGGEST_DEBOUNCE_MS);
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [memberQuery, relatedMemberId, memberId]);
+
+  const handleQueryChange = (e) => {
+    setMemberQuery(e.target.value);
+    setRelatedMemberId("");
+  };
+
+  const handleSelectSuggestion = (member) => {
+    setRelatedMemberId(member.id);
+    setMemberQuery(member.name);
+    setSuggestions([]);
+  };
 
   const handleCreateRelationship = async (e) => {
     e.preventDefault();
@@ -135,11 +179,11 @@ const RelationshipManager = ({
 
     try {
       let fromId = memberId;
-      let toId = parseInt(relatedMemberId, 10);
+      let toId = relatedMemberId;
       let type = relationType;
 
       if (relationType === "child") {
-        fromId = parseInt(relatedMemberId, 10);
+        fromId = relatedMemberId;
         toId = memberId;
         type = "parent";
       }
@@ -153,6 +197,7 @@ const RelationshipManager = ({
         ),
       });
       setRelatedMemberId("");
+      setMemberQuery("");
       setRelationType("parent");
       onRelationshipChange("create", "success");
     } catch (error) {
@@ -208,7 +253,7 @@ const RelationshipManager = ({
                 relation={rel}
                 currentMemberId={memberId}
                 onDelete={handleRelationDeleted}
-                members={allMembers}
+                members={relatedMembers}
               />
             ))}
           </ul>
@@ -233,7 +278,7 @@ const RelationshipManager = ({
               id="relationType"
               value={relationType}
               onChange={(e) => setRelationType(e.target.value)}
-              disabled={isCreating || loadingMembers}
+              disabled={isCreating}
             >
               <option value="parent">
                 {t("relationType.parent", "Parent of")}
@@ -250,28 +295,40 @@ const RelationshipManager = ({
             <label htmlFor="relatedMemberId">
               {t("relationshipManager.relatedMemberLabel", "Related Member:")}
             </label>
-            <select
+            <input
               id="relatedMemberId"
-              value={relatedMemberId}
-              onChange={(e) => setRelatedMemberId(e.target.value)}
-              required
-              disabled={isCreating || loadingMembers}
-            >
-              <option value="">
-                {t("relationshipManager.selectMember", "-- Select Member --")}
-              </option>
-              {loadingMembers ? (
-                <option disabled>{t("common.loading", "Loading...")}</option>
-              ) : (
-                allMembers.map((member) => (
-                  <option key={member.id} value={member.id}>
-                    {member.name} (ID: {member.id})
-                  </option>
-                ))
+              type="text"
+              autoComplete="off"
+              value={memberQuery}
+              onChange={handleQueryChange}
+              placeholder={t(
+                "relationshipManager.searchMemberPlaceholder",
+                "Start typing a first or last name",
               )}
-            </select>
+              disabled={isCreating}
+            />
+            {memberQuery.trim() && !relatedMemberId && (
+              <ul className="member-suggestions">
+                {suggestions.map((member) => (
+                  <li key={member.id}>
+                    <button
+                      type="button"
+                      onClick={() => handleSelectSuggestion(member)}
+                    >
+                      {member.name}
+                      {member.birth_date && ` (${member.birth_date})`}
+                    </button>
+                  </li>
+                ))}
+                {!isSuggesting && suggestions.length === 0 && (
+                  <li className="no-suggestions">
+                    {t("relationshipManager.noSuggestions", "No matches")}
+                  </li>
+                )}
+              </ul>
+            )}
           </div>
-          <button type="submit" disabled={isCreating || loadingMembers}>
+          <button type="submit" disabled={isCreating || !relatedMemberId}>
             {isCreating
               ? t("common.adding", "Adding...")
               : t("relationshipManager.addButton", "Add Relationship")}
@@ -327,10 +384,24 @@ const RelationshipManager = ({
           margin-bottom: 0.3rem;
         }
         .add-relationship-form select,
+        .add-relationship-form input,
         .add-relationship-form button {
           width: 100%;
           padding: 0.5rem;
         }
+        .member-suggestions li {
+          padding: 0;
+        }
+        .member-suggestions button {
+          text-align: left;
+          background: none;
+          border: none;
+          cursor: pointer;
+        }
+        .member-suggestions .no-suggestions {
+          padding: 0.5rem;
+          color: #6c757d;
+        }
       `}</style>
     </div>
   );
@@ -23,6 +23,10 @@ const AdminMemberListPage = () => {
   const [actionMessage, setActionMessage] = useState({ type: "", text: "" });
   const [currentPage, setCurrentPage] = useState(1);
   const [totalPages, setTotalPages] = useState(0);
+  const [hasNextPage, setHasNextPage] = useState(false);
+  // Cursor for each page reached with "Next": the next_cursor of the page
+  // before it. Pages without one are fetched by number.
+  const pageCursors = React.useRef({});
   const itemsPerPage = 10;
   const [searchTerm, setSearchTerm] = useState("");
   const [debouncedSearchTerm, setDebouncedSearchTerm] = useState(searchTerm);
@@ -32,7 +36,6 @@ const AdminMemberListPage = () => {
   const debouncedSetSearch = React.useCallback(
     debounce((value) => {
       setDebouncedSearchTerm(value);
-      setCurrentPage(1);
     }, 500),
     [],
   );
@@ -50,10 +53,18 @@ const AdminMemberListPage = () => {
         page,
         itemsPerPage,
         search,
+        pageCursors.current[page],
       );
       setMembers(data.items);
       setTotalPages(data.total_pages);
-      setCurrentPage(data.page);
+      // The response only carries a page number for numbered requests.
+      setCurrentPage(page);
+      if (data.next_cursor) {
+        pageCursors.current[page + 1] = data.next_cursor;
+      } else {
+        delete pageCursors.current[page + 1];
+      }
+      setHasNextPage(Boolean(data.next_cursor));
       setSelectedMemberIds(new Set());
     } catch (err) {
       console.error("Error fetching members:", err);
@@ -63,15 +74,18 @@ const AdminMemberListPage = () => {
       );
       setMembers([]);
       setTotalPages(0);
+      setHasNextPage(false);
       setCurrentPage(1);
+      pageCursors.current = {};
     } finally {
       setLoading(false);
     }
   };
 
   useEffect(() => {
-    fetchMembers(currentPage, debouncedSearchTerm);
-  }, [currentPage, debouncedSearchTerm]);
+    pageCursors.current = {};
+    fetchMembers(1, debouncedSearchTerm);
+  }, [debouncedSearchTerm]);
 
   const handleSearchChange = (event) => {
     setSearchTerm(event.target.value);
@@ -340,7 +354,7 @@ const AdminMemberListPage = () => {
           </span>
           <button
             onClick={() => fetchMembers(currentPage + 1)}
-            disabled={currentPage >= totalPages}
+            disabled={!hasNextPage}
           >
             {t("pagination.next", "Next")}
           </button>
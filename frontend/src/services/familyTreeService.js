@@ -21,15 +21,41 @@ const getFamilyTreeData = async () => {
   }
 };
 
-const getMembersAdmin = async (page = 1, size = 10, search = null) => {
+const getFamilyTreeWindow = async (memberId, up = 2, down = 2) => {
   console.log(
-    `Fetching paginated members for admin list: page=${page}, size=${size}, search='${search}'`,
+    `Fetching family tree window around ${memberId}: up=${up}, down=${down}`,
+  );
+  try {
+    const response = await apiClient.get(`/family/tree/${memberId}`, {
+      params: { up: up, down: down },
+    });
+    return response.data;
+  } catch (error) {
+    console.error(`Error fetching family tree window for ${memberId}:`, error);
+    throw error;
+  }
+};
+
+const getMembersAdmin = async (
+  page = 1,
+  size = 10,
+  search = null,
+  cursor = null,
+) => {
+  console.log(
+    `Fetching paginated members for admin list: page=${page}, size=${size}, search='${search}', cursor=${cursor}`,
   );
   try {
     const params = {
-      page: page,
       size: size,
     };
+    // Stepping through the list uses the previous page's next_cursor; the
+    // page number is only sent to jump to a page directly.
+    if (cursor) {
+      params.cursor = cursor;
+    } else {
+      params.page = page;
+    }
     if (search) {
       params.search = search;
     }
@@ -44,6 +70,19 @@ const getMembersAdmin = async (page = 1, size = 10, search = null) => {
   }
 };
 
+const suggestMembersAdmin = async (query, limit = 10) => {
+  try {
+    const response = await apiClient.get("/family/members/suggest", {
+      headers: getAuthHeaders(),
+      params: { q: query, limit: limit },
+    });
+    return response.data;
+  } catch (error) {
+    console.error(`Error fetching member suggestions for '${query}':`, error);
+    throw error;
+  }
+};
+
 const getMemberByIdAdmin = async (id) => {
   console.log(`Fetching member by ID for admin: ${id}`);
   try {
@@ -178,7 +217,9 @@ const batchDeleteMembersAdmin = async (memberIds) => {
 
 export default {
   getFamilyTreeData,
+  getFamilyTreeWindow,
   getMembersAdmin,
+  suggestMembersAdmin,
   getMemberByIdAdmin,
   createMemberAdmin,
   updateMemberAdmin,
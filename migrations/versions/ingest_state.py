@@ -0,0 +1,29 @@
+"""ingest state
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'ingest_state',
+        sa.Column('source', sa.String(100), primary_key=True),
+        sa.Column('content_hash', sa.String(64), nullable=False),
+        sa.Column('applied_at', sa.DateTime(), default=sa.func.now(), onupdate=sa.func.now())
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('ingest_state')
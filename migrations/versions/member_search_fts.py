@@ -0,0 +1,71 @@
+"""member search fts
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def _normalized(column: str, alias: str) -> str:
+    # Fold 'ё' into 'е' so both spellings match; FTS5's unicode61 tokenizer
+    # already handles case folding for Cyrillic.
+    return f"replace(replace({alias}.{column}, 'ё', 'е'), 'Ё', 'Е')"
+
+
+def _values(alias: str) -> str:
+    columns = ('first_name', 'last_name', 'location', 'notes')
+    return ', '.join(_normalized(column, alias) for column in columns)
+
+
+def upgrade() -> None:
+    # Full-text search is only available on SQLite (FTS5); other databases fall
+    # back to column filters in app/services/search_service.py.
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    op.execute(
+        "CREATE VIRTUAL TABLE family_members_fts USING fts5("
+        "first_name, last_name, location, notes, "
+        "tokenize = 'unicode61 remove_diacritics 2')"
+    )
+    op.execute(
+        "CREATE TRIGGER family_members_fts_ai AFTER INSERT ON family_members BEGIN "
+        "INSERT INTO family_members_fts(rowid, first_name, last_name, location, notes) "
+        f"VALUES (new.rowid, {_values('new')}); "
+        "END"
+    )
+    op.execute(
+        "CREATE TRIGGER family_members_fts_ad AFTER DELETE ON family_members BEGIN "
+        "DELETE FROM family_members_fts WHERE rowid = old.rowid; "
+        "END"
+    )
+    op.execute(
+        "CREATE TRIGGER family_members_fts_au AFTER UPDATE ON family_members BEGIN "
+        "DELETE FROM family_members_fts WHERE rowid = old.rowid; "
+        "INSERT INTO family_members_fts(rowid, first_name, last_name, location, notes) "
+        f"VALUES (new.rowid, {_values('new')}); "
+        "END"
+    )
+    op.execute(
+        "INSERT INTO family_members_fts(rowid, first_name, last_name, location, notes) "
+        f"SELECT m.rowid, {_values('m')} FROM family_members AS m"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    op.execute('DROP TRIGGER IF EXISTS family_members_fts_au')
+    op.execute('DROP TRIGGER IF EXISTS family_members_fts_ad')
+    op.execute('DROP TRIGGER IF EXISTS family_members_fts_ai')
+    op.execute('DROP TABLE IF EXISTS family_members_fts')
@@ -1,10 +1,13 @@
 import asyncio
 import logging
+import os
 from datetime import datetime, time
 
 from dotenv import load_dotenv
 
 from app.scheduler import ingest_data_job, send_birthday_notifications_job
+from app.utils.database import async_engine
+from config import config
 
 load_dotenv()
 
@@ -14,35 +17,50 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+app_config = config[os.getenv("APP_ENV", "development")]
+
 
 async def main():
     logger.info("Starting custom scheduler.")
+    ingest_interval = app_config.INGEST_INTERVAL_SECONDS
     # Set the last run times to a time in the past to ensure they run on the first check
     last_ingest_run = datetime.min
     last_birthday_run = datetime.min
+    # The notification job runs in the background so that ingests keep their
+    # schedule while its mail drains.
+    notification_task: asyncio.Task | None = None
 
-    while True:
-        now = datetime.now()
-
-        if (now - last_ingest_run).total_seconds() >= 600:
-            logger.info("Triggering data ingestion job.")
-            try:
-                await ingest_data_job()
-                last_ingest_run = now
-            except Exception as e:
-                logger.error(f"Error in ingest_data_job: {e}", exc_info=True)
-
-        if now.time() >= time(8, 0) and now.date() > last_birthday_run.date():
-            logger.info("Triggering birthday notification job.")
-            try:
-                await send_birthday_notifications_job()
-                last_birthday_run = now
-            except Exception as e:
-                logger.error(
-                    f"Error in send_birthday_notifications_job: {e}", exc_info=True
+    try:
+        while True:
+            now = datetime.now()
+
+            if (now - last_ingest_run).total_seconds() >= ingest_interval:
+                logger.info("Triggering data ingestion job.")
+                try:
+                    await ingest_data_job()
+                    last_ingest_run = now
+                except Exception as e:
+                    logger.error(f"Error in ingest_data_job: {e}", exc_info=True)
+
+            if (
+                now.time() >= time(8, 0)
+                and now.date() > last_birthday_run.date()
+                and (notification_task is None or notification_task.done())
+            ):
+                logger.info("Triggering birthday notification job.")
+                notification_task = asyncio.create_task(
+                    send_birthday_notifications_job()
                 )
+                last_birthday_run = now
 
-        await asyncio.sleep(10)
+            await asyncio.sleep(10)
+    finally:
+        if notification_task is not None and not notification_task.done():
+            notification_task.cancel()
+            await asyncio.gather(notification_task, return_exceptions=True)
+        # The scheduler owns the engine shared by all jobs.
+        await async_engine.dispose()
+        logger.info("Database engine disposed.")
 
 
 if __name__ == "__main__":
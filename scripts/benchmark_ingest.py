@@ -0,0 +1,105 @@
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models import FamilyMember, Relation
+from app.services.ingest_service import sync_family_records
+from app.utils.database import Base
+from scripts.data_sources import SyntheticSource
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    force=True,  # Imported script modules configure INFO logging on import.
+)
+logger = logging.getLogger("benchmark_ingest")
+
+
+def peak_rss_mb() -> float:
+    """Returns this process's peak resident set size in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in KiB elsewhere.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+async def ingest_once(size: int, seed: int) -> dict:
+    """Streams one synthetic family into a fresh SQLite database, then resyncs it."""
+    source = SyntheticSource(size, seed)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "bench.db")
+        engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+        async with session_factory() as session:
+            # Records are generated, parsed and written as one stream.
+            start = time.perf_counter()
+            await sync_family_records(session, source.iter_records(source.fetch()))
+            load_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            await sync_family_records(session, source.iter_records(source.fetch()))
+            resync_seconds = time.perf_counter() - start
+
+            members = await session.scalar(select(func.count(FamilyMember.id)))
+            relations = await session.scalar(select(func.count(Relation.id)))
+        await engine.dispose()
+
+    return {
+        "members": members,
+        "relations": relations,
+        "load_seconds": load_seconds,
+        "resync_seconds": resync_seconds,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run_in_worker(size: int, seed: int) -> dict:
+    return asyncio.run(ingest_once(size, seed))
+
+
+def main():
+    ap = argparse.ArgumentParser(
+        description="Benchmark ingest of synthetic family trees into SQLite."
+    )
+    ap.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1_000, 10_000, 100_000, 1_000_000],
+        help="Member counts to benchmark.",
+    )
+    ap.add_argument("--seed", type=int, default=42, help="Generator seed.")
+    args = ap.parse_args()
+
+    print(
+        f"{'members':>9} {'relations':>10} {'load s':>9} "
+        f"{'rows/s':>10} {'resync s':>9} {'peak RSS MiB':>13}"
+    )
+    # Each size runs in a fresh process so peak RSS is measured per size.
+    context = multiprocessing.get_context("spawn")
+    for size in args.sizes:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            result = pool.submit(run_in_worker, size, args.seed).result()
+        rows = result["members"] + result["relations"]
+        print(
+            f"{result['members']:>9} {result['relations']:>10} "
+            f"{result['load_seconds']:>9.2f} "
+            f"{rows / result['load_seconds']:>10.0f} {result['resync_seconds']:>9.2f} "
+            f"{result['peak_rss_mb']:>13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.services.family_service import get_all_family_members
+from app.services.ingest_service import sync_family_records
+from app.utils.database import Base
+from scripts.data_sources import iter_synthetic_records
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    force=True,  # Imported script modules configure INFO logging on import.
+)
+logger = logging.getLogger("benchmark_tree_loading")
+
+
+async def populate(session_factory: async_sessionmaker, size: int) -> None:
+    async with session_factory() as session:
+        await sync_family_records(session, iter_synthetic_records(size))
+
+
+async def measure(
+    session_factory: async_sessionmaker, counter: dict, lean: bool, repeat: int
+) -> tuple[float, int]:
+    """Returns the best wall time over `repeat` runs and the query count per run."""
+    best = float("inf")
+    for _ in range(repeat):
+        counter["queries"] = 0
+        async with session_factory() as session:
+            start = time.perf_counter()
+            await get_all_family_members(session, lean=lean)
+            best = min(best, time.perf_counter() - start)
+    return best, counter["queries"]
+
+
+async def run_benchmark(size: int, repeat: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "bench.db")
+        engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+        counter = {"queries": 0}
+
+        def count_query(*_args, **_kwargs):
+            counter["queries"] += 1
+
+        event.listen(engine.sync_engine, "before_cursor_execute", count_query)
+
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+        await populate(session_factory, size)
+
+        for label, lean in (("selectinload", False), ("flat", True)):
+            seconds, queries = await measure(session_factory, counter, lean, repeat)
+            print(
+                f"{size:>8} members  {label:<12}  {queries:>5} queries  {seconds * 1000:>10.1f} ms"
+            )
+        await engine.dispose()
+
+
+async def main():
+    ap = argparse.ArgumentParser(
+        description="Compare selectinload and flat two-query loading of the family tree."
+    )
+    ap.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1_000, 10_000, 100_000],
+        help="Member counts to benchmark.",
+    )
+    ap.add_argument("--repeat", type=int, default=3, help="Runs per measurement.")
+    args = ap.parse_args()
+
+    for size in args.sizes:
+        await run_benchmark(size, args.repeat)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
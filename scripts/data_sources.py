@@ -0,0 +1,340 @@
+"""
+Data sources for family ingest.
+
+A source fetches an export, hashes it (so unchanged exports can be skipped)
+and turns it into a stream of MemberRecords for
+`ingest_service.sync_family_records`. Records are produced lazily, so a large
+export never has to exist as one big string or as a fully parsed data set.
+
+Besides the Google Sheet used in production, local CSV files, Freeplane mind
+maps (directly or as the JSON written by `scripts/parse_tree.py`) and a
+synthetic generator are available, so ingest can be run and load-tested
+offline.
+"""
+
+import csv
+import hashlib
+import json
+import logging
+import random
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
+from datetime import date
+from pathlib import Path
+
+from app.models.family_member import GenderEnum
+from app.models.relation import RelationTypeEnum
+from app.services.ingest_service import MemberRecord, compute_content_hash
+from scripts.google_sheets_utils import get_family_rows_from_sheet, read_sheet_rows
+from scripts.ingest_validation import (
+    ValidationReport,
+    validate_records,
+    validate_sheet_rows,
+)
+
+logger = logging.getLogger(__name__)
+
+# Bytes read at a time when hashing a file.
+_HASH_CHUNK_SIZE = 1 << 20
+
+
+def safe_strip(value):
+    """Safely strip a string, handling None values"""
+    return value.strip() if value and isinstance(value, str) else ""
+
+
+def compute_rows_hash(rows: Iterable[list[str]]) -> str:
+    """Returns the SHA-256 hex digest of a table of cell values."""
+    digest = hashlib.sha256()
+    for row in rows:
+        digest.update("\x1f".join(row).encode("utf-8"))
+        digest.update(b"\x1e")
+    return digest.hexdigest()
+
+
+def compute_file_hash(path: Path) -> str:
+    """Returns the SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def iter_csv_records(rows: Iterable[list[str]]) -> Iterator[MemberRecord]:
+    """
+    Turns rows in the sheet's layout (header row first) into MemberRecords.
+
+    Rows without an `id` are skipped. Each date column is parsed in its own
+    dominant format, detected from the first rows (see DateColumnParser).
+    """
+    _, date_parsers, row_dicts = read_sheet_rows(rows)
+    parse_birth_date = date_parsers["birth_date"]
+    parse_death_date = date_parsers["death_date"]
+
+    for row in row_dicts:
+        member_id = safe_strip(row.get("id", ""))
+        if not member_id:
+            logger.warning(f"Skipping row without id: {row}")
+            continue
+
+        relations = []
+        for parent_key in ("mother_id", "father_id"):
+            parent_id = safe_strip(row.get(parent_key, ""))
+            if parent_id:
+                relations.append((parent_id, member_id, RelationTypeEnum.PARENT))
+        spouse_id = safe_strip(row.get("spouse_id", ""))
+        if spouse_id:
+            relations.append((member_id, spouse_id, RelationTypeEnum.SPOUSE))
+
+        yield MemberRecord(
+            id=member_id,
+            fields={
+                "first_name": safe_strip(row.get("first_name", "")),
+                "last_name": safe_strip(row.get("last_name", "")) or None,
+                "birth_date": parse_birth_date(safe_strip(row.get("birth_date", ""))),
+                "death_date": parse_death_date(safe_strip(row.get("death_date", ""))),
+                "gender": GenderEnum[safe_strip(row.get("gender", "")).upper()]
+                if row.get("gender")
+                else None,
+                "location": safe_strip(row.get("location", "")) or None,
+                "notes": safe_strip(row.get("notes", "")) or None,
+            },
+            relations=tuple(relations),
+        )
+
+
+def tree_node_record(
+    member_id: str, parent_id: str | None, name: str | None
+) -> MemberRecord:
+    """
+    Builds the record of a mind map node. The node's text up to the first
+    comma is taken as the name (stored as first_name); anything after it is
+    kept in notes. The parent node, if any, becomes a PARENT relation.
+    """
+    name, _, details = (name or "").partition(",")
+    return MemberRecord(
+        id=member_id,
+        fields={
+            "first_name": name.strip(),
+            "last_name": None,
+            "birth_date": None,
+            "death_date": None,
+            "gender": None,
+            "location": None,
+            "notes": details.strip() or None,
+        },
+        relations=((parent_id, member_id, RelationTypeEnum.PARENT),)
+        if parent_id is not None
+        else (),
+    )
+
+
+def iter_tree_json_records(nodes: list[dict]) -> Iterator[MemberRecord]:
+    """
+    Turns the nested node list written by `scripts/parse_tree.py` into
+    MemberRecords (see `tree_node_record`), nesting becoming PARENT relations.
+    """
+    stack = [(None, node) for node in reversed(nodes)]
+    while stack:
+        parent_id, node = stack.pop()
+        member_id = node.get("id")
+        if not member_id:
+            logger.warning(f"Skipping tree node without id: {node.get('name')!r}")
+            continue
+
+        yield tree_node_record(member_id, parent_id, node.get("name"))
+        stack.extend((member_id, child) for child in reversed(node.get("children", [])))
+
+
+def iter_freeplane_records(
+    path: Path, workers: int = 1, with_names: bool = True
+) -> Iterator[MemberRecord]:
+    """
+    Reads a Freeplane mind map (.mm) straight into MemberRecords, without the
+    intermediate JSON file. Freeplane node IDs (`ID_123...`) are kept as
+    member IDs: Freeplane assigns them once and preserves them across edits,
+    so re-importing an edited map updates members in place.
+
+    Args:
+        path: The .mm file.
+        workers: Processes used to extract names from rich content.
+        with_names: If False, names are left empty and the rich content is
+            not parsed (enough to validate the structure).
+    """
+    # parse_tree needs BeautifulSoup, which only mind map imports require.
+    from scripts.parse_tree import iter_tree_nodes
+
+    for member_id, parent_id, name in iter_tree_nodes(path, workers, with_names):
+        if not member_id:
+            logger.warning(f"Skipping mind map node without ID: {name!r}")
+            continue
+        yield tree_node_record(member_id, parent_id, name)
+
+
+def iter_synthetic_records(size: int, seed: int = 42) -> Iterator[MemberRecord]:
+    """
+    Generates `size` members where every member after the first has one or
+    two parents chosen among earlier members; two parents are married.
+    """
+    rng = random.Random(seed)
+    for i in range(size):
+        member_id = f"m{i:07d}"
+        relations = []
+        if i:
+            parents = sorted({rng.randrange(0, i), rng.randrange(0, i)})
+            for parent in parents:
+                relations.append((f"m{parent:07d}", member_id, RelationTypeEnum.PARENT))
+            if len(parents) == 2:
+                first, second = parents
+                relations.append(
+                    (f"m{first:07d}", f"m{second:07d}", RelationTypeEnum.SPOUSE)
+                )
+        yield MemberRecord(
+            id=member_id,
+            fields={
+                "first_name": f"First{i}",
+                "last_name": f"Last{i % 500}",
+                "birth_date": date(1900 + i % 120, 1 + i % 12, 1 + i % 28),
+                "death_date": None,
+                "gender": GenderEnum.MALE if i % 2 else GenderEnum.FEMALE,
+                "location": None,
+                "notes": None,
+            },
+            relations=tuple(relations),
+        )
+
+
+class FamilyDataSource(ABC):
+    """
+    Base class for ingest sources.
+
+    Attributes:
+        name: Stable identifier, used as `IngestState.source` for the
+            last-applied content hash.
+    """
+
+    name: str
+
+    @abstractmethod
+    def fetch(self):
+        """Returns a handle on the export (rows, a path...), or None if unavailable."""
+
+    @abstractmethod
+    def content_hash(self, export) -> str:
+        """Returns a hash that changes whenever the export's content does."""
+
+    @abstractmethod
+    def iter_records(self, export) -> Iterator[MemberRecord]:
+        """Yields the export's members one at a time."""
+
+    def validate(self, export) -> ValidationReport:
+        """Checks the export without touching the database."""
+        return validate_records(self.iter_records(export), self.name)
+
+
+class GoogleSheetSource(FamilyDataSource):
+    """The family sheet in Google Sheets, read as rows of cell values."""
+
+    name = "google_sheet"
+
+    def fetch(self) -> list[list[str]] | None:
+        return get_family_rows_from_sheet()
+
+    def content_hash(self, export: list[list[str]]) -> str:
+        return compute_rows_hash(export)
+
+    def iter_records(self, export: list[list[str]]) -> Iterator[MemberRecord]:
+        return iter_csv_records(export)
+
+    def validate(self, export: list[list[str]]) -> ValidationReport:
+        return validate_sheet_rows(export, self.name)
+
+
+class _FileSource(FamilyDataSource):
+    """A local file, hashed in chunks rather than read whole."""
+
+    kind: str
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.name = f"{self.kind}:{self.path.name}"
+
+    def fetch(self) -> Path | None:
+        if not self.path.is_file():
+            logger.error(f"{self.kind.upper()} file not found: {self.path}")
+            return None
+        return self.path
+
+    def content_hash(self, export: Path) -> str:
+        return compute_file_hash(export)
+
+
+class CsvFileSource(_FileSource):
+    """A local CSV file in the sheet's layout, read row by row."""
+
+    kind = "csv"
+
+    def iter_records(self, export: Path) -> Iterator[MemberRecord]:
+        with open(export, encoding="utf-8", newline="") as f:
+            yield from iter_csv_records(csv.reader(f))
+
+    def validate(self, export: Path) -> ValidationReport:
+        with open(export, encoding="utf-8", newline="") as f:
+            return validate_sheet_rows(csv.reader(f), self.name)
+
+
+class JsonTreeSource(_FileSource):
+    """A JSON file produced by `scripts/parse_tree.py`."""
+
+    kind = "json"
+
+    def iter_records(self, export: Path) -> Iterator[MemberRecord]:
+        # A nested JSON document has to be loaded whole; records are still
+        # handed on one at a time.
+        with open(export, encoding="utf-8") as f:
+            nodes = json.load(f)
+        yield from iter_tree_json_records(nodes)
+
+
+class FreeplaneSource(_FileSource):
+    """
+    A Freeplane mind map (.mm), imported directly. Names are extracted from
+    rich content in `workers` processes.
+    """
+
+    kind = "mm"
+
+    def __init__(self, path: str | Path, workers: int = 1):
+        super().__init__(path)
+        self.workers = workers
+
+    def iter_records(self, export: Path) -> Iterator[MemberRecord]:
+        return iter_freeplane_records(export, self.workers)
+
+    def validate(self, export: Path) -> ValidationReport:
+        # The checks only concern IDs and nesting, so skip the costly names.
+        return validate_records(
+            iter_freeplane_records(export, with_names=False), self.name
+        )
+
+
+class SyntheticSource(FamilyDataSource):
+    """
+    A generated family of a given size. The "export" is just the generator
+    parameters, so the same size and seed hash (and generate) identically.
+    """
+
+    def __init__(self, size: int, seed: int = 42):
+        self.size = size
+        self.seed = seed
+        self.name = f"synthetic:{size}:{seed}"
+
+    def fetch(self) -> str:
+        return self.name
+
+    def content_hash(self, export: str) -> str:
+        return compute_content_hash(export)
+
+    def iter_records(self, export: str) -> Iterator[MemberRecord]:
+        return iter_synthetic_records(self.size, self.seed)
@@ -1,146 +1,91 @@
-import csv
-import io
 import logging
 
-from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.family_member import GenderEnum
-from app.models.relation import RelationTypeEnum
-from app.schemas.family import FamilyMemberCreate
-from app.services.family_service import create_family_member, create_relationship
-from scripts.google_sheets_utils import get_family_data_from_sheet, parse_sheet_date
+from app.services.ingest_service import get_applied_content_hash, sync_family_records
+from scripts.data_sources import FamilyDataSource, GoogleSheetSource
+from scripts.ingest_validation import ValidationReport
 
 logger = logging.getLogger(__name__)
 
+# Issues written to the log when validating; the full list is in the report.
+LOGGED_VALIDATION_ISSUES = 20
 
-def safe_strip(value):
-    """Safely strip a string, handling None values"""
-    return value.strip() if value and isinstance(value, str) else ""
 
+def log_validation_report(report: ValidationReport) -> None:
+    """Logs a report's summary and its first issues."""
+    log = logger.info if report.is_valid else logger.error
+    log(f"Validation of {report.source}: {report.summary()}")
+    for issue in report.issues[:LOGGED_VALIDATION_ISSUES]:
+        location = f"row {issue.row}: " if issue.row else ""
+        log(f"  [{issue.severity}] {location}{issue.message}")
+    if len(report.issues) > LOGGED_VALIDATION_ISSUES:
+        log(f"  ... and {len(report.issues) - LOGGED_VALIDATION_ISSUES} more")
 
-async def process_family_data(db: AsyncSession):
+
+async def process_family_data(
+    db: AsyncSession | None,
+    force: bool = False,
+    source: FamilyDataSource | None = None,
+    dry_run: bool = False,
+) -> ValidationReport | None:
     """
-    Fetches family data from Google Sheets, purges existing data,
-    and populates the database with new data.
+    Fetches family data (from Google Sheets unless another source is given)
+    and brings the database in line with it, writing only the members and
+    relations that changed.
+
+    Rows flow from the source through parsing into batched writes without the
+    whole data set being materialized. If the export is identical to the one
+    applied last time, validation, parsing and the database comparison are
+    skipped entirely, unless `force` is set (e.g. to revert manual edits made
+    through the admin UI). A changed export is validated first and is not
+    applied at all if the validation finds errors.
+
+    Args:
+        db: The asynchronous database session; unused (may be None) with
+            `dry_run`.
+        force: Apply the export even if it is unchanged since the last ingest.
+        source: Where to read the data from; defaults to the Google Sheet.
+        dry_run: Only validate the export, without touching the database.
+
+    Returns:
+        The ValidationReport, or None if nothing was fetched or the export was
+        skipped as unchanged.
     """
-    logger.info("Starting family data processing from Google Sheets")
+    source = source or GoogleSheetSource()
+    logger.info(f"Starting family data processing from {source.name}")
 
-    csv_data = get_family_data_from_sheet()
-    if not csv_data:
+    export = source.fetch()
+    if not export:
         logger.error("No data downloaded, exiting")
-        return
-
-    logger.info("Parsing CSV data")
-    reader = csv.DictReader(io.StringIO(csv_data))
-    members_data = []
-    relationships = []
-
-    for row in reader:
-        member = {
-            "id": safe_strip(row.get("id", "")),
-            "first_name": safe_strip(row.get("first_name", "")),
-            "last_name": safe_strip(row.get("last_name", "")) or None,
-            "birth_date": parse_sheet_date(safe_strip(row.get("birth_date", ""))),
-            "death_date": parse_sheet_date(safe_strip(row.get("death_date", ""))),
-            "gender": GenderEnum[safe_strip(row.get("gender", "")).upper()]
-            if row.get("gender")
-            else None,
-            "location": safe_strip(row.get("location", "")) or None,
-            "notes": safe_strip(row.get("notes", "")) or None,
-        }
-        members_data.append(member)
-
-        relationships.append(
-            {
-                "member_id": member["id"],
-                "mother_id": safe_strip(row.get("mother_id", "")) or None,
-                "father_id": safe_strip(row.get("father_id", "")) or None,
-                "spouse_id": safe_strip(row.get("spouse_id", "")) or None,
-            }
+        return None
+
+    content_hash = source.content_hash(export)
+    if (
+        not dry_run
+        and not force
+        and content_hash == await get_applied_content_hash(db, source.name)
+    ):
+        logger.info(
+            f"Source unchanged since last ingest (hash {content_hash[:12]}), skipping"
         )
-
-    try:
-        logger.info("Purging existing family data")
-        await db.execute(text("DELETE FROM relations"))
-        await db.execute(text("DELETE FROM family_members"))
-        await db.flush()
-
-        logger.info(f"Processing {len(members_data)} members from Google Sheet...")
-        members_cache = {}
-
-        for member_data in members_data:
-            member_id = member_data["id"]
-            try:
-                member_create = FamilyMemberCreate(
-                    first_name=member_data["first_name"],
-                    last_name=member_data["last_name"],
-                    birth_date=member_data["birth_date"],
-                    death_date=member_data["death_date"],
-                    gender=member_data["gender"],
-                    location=member_data["location"],
-                    notes=member_data["notes"],
-                )
-
-                member = await create_family_member(
-                    db, member_create, member_id=member_id
-                )
-                await db.flush()
-                members_cache[member_id] = member.id
-                logger.info(
-                    f"Created member: {member_data['first_name']} (ID: {member_id})"
-                )
-            except Exception as e:
-                logger.error(
-                    f"Failed to create member {member_data['first_name']}: {str(e)}"
-                )
-                continue
-
-        logger.info("Creating relationships...")
-
-        for rel_data in relationships:
-            member_id = rel_data["member_id"]
-            if member_id not in members_cache:
-                continue
-
-            for parent_type, parent_id in [
-                ("mother", rel_data["mother_id"]),
-                ("father", rel_data["father_id"]),
-            ]:
-                if parent_id and parent_id in members_cache:
-                    try:
-                        await create_relationship(
-                            db,
-                            from_member_id=members_cache[parent_id],
-                            to_member_id=members_cache[member_id],
-                            relation_type=RelationTypeEnum.PARENT,
-                        )
-                        logger.info(
-                            f"Created parent relationship: {parent_id} -> {member_id}"
-                        )
-                    except Exception as e:
-                        logger.error(
-                            f"Failed to create {parent_type} relationship: {str(e)}"
-                        )
-
-            if rel_data["spouse_id"] and rel_data["spouse_id"] in members_cache:
-                try:
-                    await create_relationship(
-                        db,
-                        from_member_id=members_cache[member_id],
-                        to_member_id=members_cache[rel_data["spouse_id"]],
-                        relation_type=RelationTypeEnum.SPOUSE,
-                    )
-                    logger.info(
-                        f"Created spouse relationship: {member_id} -> {rel_data['spouse_id']}"
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to create spouse relationship: {str(e)}")
-
-        await db.commit()
-        logger.info("Database processing completed successfully")
-
-    except Exception as e:
-        logger.exception(f"Data processing failed: {e}")
-        await db.rollback()
-        raise
+        return None
+
+    report = source.validate(export)
+    report.content_hash = content_hash
+    log_validation_report(report)
+    if dry_run:
+        return report
+    if not report.is_valid:
+        logger.error("Validation failed; the database was left unchanged")
+        return report
+
+    logger.info("Syncing source data")
+    stats = await sync_family_records(
+        db,
+        source.iter_records(export),
+        source=source.name,
+        content_hash=content_hash,
+    )
+    logger.info(f"Database processing completed successfully ({stats.summary()})")
+    return report
@@ -1,8 +1,10 @@
-import csv
-import io
 import logging
 import os
-from datetime import date, datetime
+import re
+from collections.abc import Iterable, Iterator
+from datetime import date
+from functools import lru_cache
+from itertools import chain, islice
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -20,34 +22,168 @@ logger = logging.getLogger("google_sheets_utils")
 load_dotenv()
 
 
+# Columns of the family sheet, addressed by the names in its header row.
+SHEET_COLUMNS = (
+    "id",
+    "first_name",
+    "last_name",
+    "birth_date",
+    "death_date",
+    "gender",
+    "location",
+    "notes",
+    "mother_id",
+    "father_id",
+    "spouse_id",
+)
+REQUIRED_SHEET_COLUMNS = ("id", "first_name")
+SHEET_DATE_COLUMNS = ("birth_date", "death_date")
+
+# Rows sampled to detect each date column's dominant format.
+DATE_FORMAT_SAMPLE_SIZE = 500
+
+_MONTHS = {
+    name: number
+    for number, names in enumerate(
+        (
+            ("jan", "january"),
+            ("feb", "february"),
+            ("mar", "march"),
+            ("apr", "april"),
+            ("may",),
+            ("jun", "june"),
+            ("jul", "july"),
+            ("aug", "august"),
+            ("sep", "september"),
+            ("oct", "october"),
+            ("nov", "november"),
+            ("dec", "december"),
+        ),
+        start=1,
+    )
+    for name in names
+}
+
+# Supported formats in order of preference, as (name, pattern, field order).
+# Field order letters: y = year, m = month number, d = day, b = month name.
+_DATE_FORMATS = [
+    ("%Y-%m-%d", re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})"), "ymd"),  # ISO (preferred)
+    ("%d/%m/%Y", re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})"), "dmy"),  # 19/04/1953
+    ("%m/%d/%Y", re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})"), "mdy"),  # 04/19/1953
+    ("%d-%m-%Y", re.compile(r"(\d{1,2})-(\d{1,2})-(\d{4})"), "dmy"),  # 19-04-1953
+    (
+        "%d %b %Y",
+        re.compile(r"(\d{1,2}) ([A-Za-z]+) (\d{4})"),
+        "dby",
+    ),  # 19 Apr 1953, 19 April 1953
+    ("%Y/%m/%d", re.compile(r"(\d{4})/(\d{1,2})/(\d{1,2})"), "ymd"),  # 1953/04/19
+]
+
+
+def _match_date(date_format: tuple, date_str: str) -> date | None:
+    """Parses `date_str` with one entry of _DATE_FORMATS, or returns None."""
+    _, pattern, order = date_format
+    match = pattern.fullmatch(date_str)
+    if match is None:
+        return None
+    fields = dict(zip(order, match.groups()))
+    if "b" in fields:
+        month = _MONTHS.get(fields["b"].lower())
+        if month is None:
+            return None
+    else:
+        month = int(fields["m"])
+    try:
+        return date(int(fields["y"]), month, int(fields["d"]))
+    except ValueError:  # Well-formed but not a real date, e.g. 31/02/1953.
+        return None
+
+
+@lru_cache(maxsize=8192)
 def parse_sheet_date(date_str: str) -> date | None:
     """Parse date string from various formats into date object"""
     if not date_str:
         return None
 
-    # Try different date formats
-    formats = [
-        "%Y-%m-%d",  # ISO format (preferred)
-        "%d/%m/%Y",  # 19/04/1953
-        "%m/%d/%Y",  # 04/19/1953 (US format)
-        "%d-%m-%Y",  # 19-04-1953
-        "%d %b %Y",  # 19 Apr 1953
-        "%d %B %Y",  # 19 April 1953
-        "%Y/%m/%d",  # 1953/04/19
-    ]
-
-    for fmt in formats:
-        try:
-            return datetime.strptime(date_str, fmt).date()
-        except ValueError:
-            continue
+    for date_format in _DATE_FORMATS:
+        parsed = _match_date(date_format, date_str)
+        if parsed is not None:
+            return parsed
 
     logger.warning(f"Invalid date format: {date_str}")
     return None
 
 
-def get_family_data_from_sheet():
-    """Download Google Sheet as CSV using service account credentials"""
+class DateColumnParser:
+    """
+    Parses the dates of one sheet column.
+
+    The column's dominant format is detected once from a sample of its values
+    and tried first for every cell; cells it does not match fall back to
+    `parse_sheet_date`. Results are memoized, since birth and death dates
+    repeat a lot in large sheets.
+
+    Note that for ambiguous day/month values (e.g. 04/05/1953) the dominant
+    format wins, so a column of US-style dates is read consistently.
+    """
+
+    def __init__(self, sample: Iterable[str]):
+        counts = [0] * len(_DATE_FORMATS)
+        for value in sample:
+            if value:
+                for i, date_format in enumerate(_DATE_FORMATS):
+                    if _match_date(date_format, value) is not None:
+                        counts[i] += 1
+        best = max(range(len(counts)), key=lambda i: (counts[i], -i))
+        self._format = _DATE_FORMATS[best] if counts[best] else None
+        self._cache: dict[str, date | None] = {}
+
+    @property
+    def format(self) -> str | None:
+        """The detected dominant format, e.g. '%d/%m/%Y', or None if unknown."""
+        return self._format[0] if self._format else None
+
+    def __call__(self, date_str: str) -> date | None:
+        if not date_str:
+            return None
+        try:
+            return self._cache[date_str]
+        except KeyError:
+            pass
+        parsed = None
+        if self._format is not None:
+            parsed = _match_date(self._format, date_str)
+        if parsed is None:
+            parsed = parse_sheet_date(date_str)
+        self._cache[date_str] = parsed
+        return parsed
+
+
+def read_sheet_rows(
+    rows: Iterable[list[str]],
+) -> tuple[list[str], dict[str, DateColumnParser], Iterator[dict[str, str]]]:
+    """
+    Splits sheet rows into the header, a DateColumnParser per date column and
+    the data rows as dicts keyed by column name.
+
+    The parsers are primed from the first rows, which are buffered and still
+    yielded, so `rows` may be a one-shot iterator (e.g. a csv.reader).
+    """
+    rows = iter(rows)
+    header = next(rows, [])
+    sample = [dict(zip(header, row)) for row in islice(rows, DATE_FORMAT_SAMPLE_SIZE)]
+    parsers = {
+        column: DateColumnParser((row.get(column) or "").strip() for row in sample)
+        for column in SHEET_DATE_COLUMNS
+    }
+    return header, parsers, chain(sample, (dict(zip(header, row)) for row in rows))
+
+
+def get_family_rows_from_sheet() -> list[list[str]] | None:
+    """
+    Download the Google Sheet's cell values using service account credentials.
+    The first row holds the column names.
+    """
     try:
         service_account_file_name = os.getenv("GOOGLE_SERVICE_ACCOUNT_FILE")
         SPREADSHEET_ID = os.getenv("GOOGLE_SPREADSHEET_ID")
@@ -86,10 +222,7 @@ def get_family_data_from_sheet():
             logger.error("No data found in sheet")
             return None
 
-        output = io.StringIO()
-        writer = csv.writer(output)
-        writer.writerows(values)
-        return output.getvalue()
+        return values
 
     except Exception as e:
         logger.error(f"Error downloading sheet: {str(e)}")
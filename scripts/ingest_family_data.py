@@ -1,7 +1,11 @@
+import argparse
 import asyncio
 import logging
+import os
+import sys
 
-from app.utils.database import AsyncSessionFactory
+from app.utils.database import AsyncSessionFactory, async_engine
+from scripts.data_sources import CsvFileSource, FreeplaneSource, JsonTreeSource
 from scripts.data_utils import process_family_data
 
 # Configure logging
@@ -14,15 +18,65 @@ logger = logging.getLogger("ingest_family_data")
 
 async def main():
     """Main function to ingest family data."""
+    ap = argparse.ArgumentParser(
+        description="Ingest family data from Google Sheets or a local file."
+    )
+    source_group = ap.add_mutually_exclusive_group()
+    source_group.add_argument(
+        "--csv", help="Ingest a local CSV file in the sheet's layout instead."
+    )
+    source_group.add_argument(
+        "--json", help="Ingest a JSON file produced by parse_tree.py instead."
+    )
+    source_group.add_argument(
+        "--mm", help="Ingest a Freeplane mind map (.mm) directly instead."
+    )
+    ap.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-apply the data even if it is unchanged since the last ingest.",
+    )
+    ap.add_argument(
+        "--dry-run",
+        action="store_true",
+        help=(
+            "Only validate the data and print a JSON report to stdout, without "
+            "touching the database. Exits with status 1 if there are errors."
+        ),
+    )
+    args = ap.parse_args()
+
+    source = None
+    if args.csv:
+        source = CsvFileSource(args.csv)
+    elif args.json:
+        source = JsonTreeSource(args.json)
+    elif args.mm:
+        source = FreeplaneSource(args.mm, workers=os.cpu_count() or 1)
+
+    if args.dry_run:
+        report = await process_family_data(None, source=source, dry_run=True)
+        if report is not None:
+            print(report.to_json())
+        await async_engine.dispose()
+        return 0 if report is not None and report.is_valid else 1
+
     logger.info("Starting family data ingestion cron job.")
     try:
         async with AsyncSessionFactory() as session:
-            await process_family_data(session)
+            report = await process_family_data(session, force=args.force, source=source)
+        if report is not None and not report.is_valid:
+            logger.error("Family data ingestion cron job rejected invalid data.")
+            return 1
         logger.info("Family data ingestion cron job finished successfully.")
+        return 0
     except Exception as e:
         logger.error(f"Family data ingestion cron job failed: {e}", exc_info=True)
         raise
+    finally:
+        # Open aiosqlite connections would otherwise keep the process alive.
+        await async_engine.dispose()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,324 @@
+"""
+Validation of family exports before they are applied.
+
+Checks a whole export in memory, without touching the database, and collects
+every problem into a ValidationReport: missing columns, unparseable dates,
+unknown genders, duplicate IDs, references to members that do not exist and
+cycles in the parent relations. Errors block the ingest; warnings are only
+reported. The report serializes to JSON for tooling and CI.
+"""
+
+import json
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass, field
+
+from app.models.family_member import GenderEnum
+from app.models.relation import RelationTypeEnum
+from app.services.family_graph import FamilyGraph
+from app.services.ingest_service import MemberRecord
+from scripts.google_sheets_utils import (
+    REQUIRED_SHEET_COLUMNS,
+    SHEET_COLUMNS,
+    SHEET_DATE_COLUMNS,
+    read_sheet_rows,
+)
+
+ERROR = "error"
+WARNING = "warning"
+
+# Issues kept in a report; further ones are only counted.
+MAX_REPORTED_ISSUES = 1000
+
+_REFERENCE_COLUMNS = ("mother_id", "father_id", "spouse_id")
+_GENDERS = {gender.name for gender in GenderEnum}
+
+
+@dataclass
+class ValidationIssue:
+    """
+    A single problem found in an export.
+
+    `row` is the 1-based row number in the sheet (the header being row 1), or
+    None for sources without rows.
+    """
+
+    severity: str
+    code: str
+    message: str
+    row: int | None = None
+    member_id: str | None = None
+    field: str | None = None
+    value: str | None = None
+
+
+@dataclass
+class ValidationReport:
+    """Outcome of validating one export."""
+
+    source: str
+    content_hash: str | None = None
+    rows: int = 0
+    members: int = 0
+    relations: int = 0
+    error_count: int = 0
+    warning_count: int = 0
+    issues: list[ValidationIssue] = field(default_factory=list)
+
+    @property
+    def is_valid(self) -> bool:
+        """True if the export has no errors (warnings are allowed)."""
+        return self.error_count == 0
+
+    def add(self, severity: str, code: str, message: str, **context) -> None:
+        if severity == ERROR:
+            self.error_count += 1
+        else:
+            self.warning_count += 1
+        if len(self.issues) < MAX_REPORTED_ISSUES:
+            self.issues.append(ValidationIssue(severity, code, message, **context))
+
+    def summary(self) -> str:
+        return (
+            f"{self.members} members, {self.relations} relations: "
+            f"{self.error_count} errors, {self.warning_count} warnings"
+        )
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["valid"] = self.is_valid
+        data["truncated"] = self.error_count + self.warning_count > len(self.issues)
+        return data
+
+    def to_json(self, indent: int | None = 2) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=indent)
+
+
+class _ReferenceChecker:
+    """
+    Collects members and the IDs they reference, then checks the references
+    once every member is known.
+    """
+
+    def __init__(self, report: ValidationReport):
+        self.report = report
+        self.row_of: dict[str, int | None] = {}
+        self.references: list[tuple[int | None, str, str, str]] = []
+        self.parent_edges: list[tuple[str, str, str]] = []
+
+    def add_member(self, row: int | None, member_id: str) -> bool:
+        """Registers a member; returns False (and reports) if the ID repeats."""
+        if member_id in self.row_of:
+            first_row = self.row_of[member_id]
+            where = f" (first seen in row {first_row})" if first_row else ""
+            self.report.add(
+                ERROR,
+                "duplicate_id",
+                f"Member id {member_id!r} is used more than once{where}.",
+                row=row,
+                member_id=member_id,
+                field="id",
+                value=member_id,
+            )
+            return False
+        self.row_of[member_id] = row
+        return True
+
+    def add_reference(
+        self,
+        row: int | None,
+        member_id: str,
+        column: str,
+        target_id: str,
+        relation: tuple[str, str, RelationTypeEnum],
+    ) -> None:
+        self.references.append((row, member_id, column, target_id))
+        if relation[2] == RelationTypeEnum.PARENT:
+            self.parent_edges.append(
+                (relation[0], relation[1], RelationTypeEnum.PARENT.value)
+            )
+        self.report.relations += 1
+
+    def finish(self) -> None:
+        report = self.report
+        report.members = len(self.row_of)
+        for row, member_id, column, target_id in self.references:
+            if target_id == member_id:
+                report.add(
+                    ERROR,
+                    "self_reference",
+                    f"Member {member_id!r} references itself in {column}.",
+                    row=row,
+                    member_id=member_id,
+                    field=column,
+                    value=target_id,
+                )
+            elif target_id not in self.row_of:
+                report.add(
+                    ERROR,
+                    "dangling_reference",
+                    f"{column} of {member_id!r} points to unknown member "
+                    f"{target_id!r}.",
+                    row=row,
+                    member_id=member_id,
+                    field=column,
+                    value=target_id,
+                )
+
+        graph = FamilyGraph.from_relations(self.row_of, self.parent_edges)
+        for node in graph.parent_cycle_nodes():
+            member_id = graph.ids[node]
+            report.add(
+                ERROR,
+                "parent_cycle",
+                f"Member {member_id!r} is recorded as their own ancestor.",
+                row=self.row_of[member_id],
+                member_id=member_id,
+            )
+
+
+def validate_sheet_rows(rows: Iterable[list[str]], source: str) -> ValidationReport:
+    """
+    Validates rows in the sheet's layout (header row first).
+
+    Dates are checked with the same per-column format detection the ingest
+    uses, so a date is reported exactly when the ingest would drop it.
+
+    Args:
+        rows: The sheet's cell values; may be a one-shot iterator.
+        source: Name of the data source, recorded in the report.
+
+    Returns:
+        The ValidationReport.
+    """
+    report = ValidationReport(source=source)
+    header, date_parsers, row_dicts = read_sheet_rows(rows)
+
+    missing = [column for column in REQUIRED_SHEET_COLUMNS if column not in header]
+    for column in missing:
+        report.add(
+            ERROR,
+            "missing_column",
+            f"Required column {column!r} is missing.",
+            row=1,
+            field=column,
+        )
+    if missing:
+        return report
+    for column in header:
+        if column not in SHEET_COLUMNS:
+            report.add(
+                WARNING,
+                "unknown_column",
+                f"Column {column!r} is not used and will be ignored.",
+                row=1,
+                field=column,
+            )
+
+    checker = _ReferenceChecker(report)
+    for row_number, row in enumerate(row_dicts, start=2):
+        report.rows += 1
+        values = {column: (value or "").strip() for column, value in row.items()}
+        member_id = values.get("id", "")
+        if not member_id:
+            if any(values.values()):
+                report.add(
+                    WARNING,
+                    "missing_id",
+                    "Row has no id and will be skipped.",
+                    row=row_number,
+                    field="id",
+                )
+            continue
+        if not checker.add_member(row_number, member_id):
+            continue
+
+        if not values.get("first_name"):
+            report.add(
+                WARNING,
+                "missing_first_name",
+                f"Member {member_id!r} has no first name.",
+                row=row_number,
+                member_id=member_id,
+                field="first_name",
+            )
+
+        dates = {}
+        for column in SHEET_DATE_COLUMNS:
+            value = values.get(column, "")
+            if value:
+                dates[column] = date_parsers[column](value)
+                if dates[column] is None:
+                    report.add(
+                        ERROR,
+                        "invalid_date",
+                        f"{column} {value!r} of {member_id!r} is not a valid date.",
+                        row=row_number,
+                        member_id=member_id,
+                        field=column,
+                        value=value,
+                    )
+        birth_date, death_date = dates.get("birth_date"), dates.get("death_date")
+        if birth_date and death_date and death_date < birth_date:
+            report.add(
+                WARNING,
+                "death_before_birth",
+                f"Member {member_id!r} died before being born.",
+                row=row_number,
+                member_id=member_id,
+                field="death_date",
+                value=values["death_date"],
+            )
+
+        gender = values.get("gender", "")
+        if gender and gender.upper() not in _GENDERS:
+            report.add(
+                ERROR,
+                "invalid_gender",
+                f"Gender {gender!r} of {member_id!r} is not one of "
+                f"{', '.join(sorted(_GENDERS))}.",
+                row=row_number,
+                member_id=member_id,
+                field="gender",
+                value=gender,
+            )
+
+        for column in _REFERENCE_COLUMNS:
+            target_id = values.get(column, "")
+            if not target_id:
+                continue
+            if column == "spouse_id":
+                relation = (member_id, target_id, RelationTypeEnum.SPOUSE)
+            else:
+                relation = (target_id, member_id, RelationTypeEnum.PARENT)
+            checker.add_reference(row_number, member_id, column, target_id, relation)
+
+    checker.finish()
+    return report
+
+
+def validate_records(records: Iterable[MemberRecord], source: str) -> ValidationReport:
+    """
+    Validates already-parsed records: duplicate IDs, dangling or
+    self-referencing relations and parent cycles.
+
+    Args:
+        records: The source's MemberRecords; may be a generator.
+        source: Name of the data source, recorded in the report.
+
+    Returns:
+        The ValidationReport.
+    """
+    report = ValidationReport(source=source)
+    checker = _ReferenceChecker(report)
+    for record in records:
+        report.rows += 1
+        if not checker.add_member(None, record.id):
+            continue
+        for relation in record.relations:
+            from_id, to_id, relation_type = relation
+            target_id = from_id if to_id == record.id else to_id
+            checker.add_reference(
+                None, record.id, relation_type.value.lower(), target_id, relation
+            )
+    checker.finish()
+    return report
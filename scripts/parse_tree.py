@@ -1,56 +1,285 @@
+"""
+Converts a Freeplane mind map (.mm) of the family into the nested JSON read by
+`scripts.data_sources.JsonTreeSource`.
+
+The XML is read with `iterparse` and an explicit stack, so neither file size
+nor tree depth is limited by memory for the whole document or by the recursion
+limit. Each top-level branch is released as soon as it has been read: the
+HTML-to-text extraction of its rich-content nodes runs in a process pool
+while the next branches are parsed, and finished branches are written to the
+output file in order.
+"""
+
 import argparse
 import json
+import os
 import pathlib
 import xml.etree.ElementTree as ET
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
 
 try:
     from bs4 import BeautifulSoup
-except ImportError:
-    print(
+except ImportError as e:
+    # Raised rather than exiting: ingest imports this module at runtime, and a
+    # SystemExit there would escape the callers' error handling.
+    raise ImportError(
         "BeautifulSoup is not installed. Please install it using: pip install beautifulsoup4"
-    )
-    exit(1)
-
-
-def xmlToDict(xml_element, debug=False):
-    output = []
-    for elem in xml_element.findall("node"):
-        person_data = {}
-
-        person_data["id"] = elem.get("ID")
-
-        rich_content_element = elem.find("richcontent")
-        if rich_content_element is not None:
-            html_content = rich_content_element.text
-            if html_content:
-                soup = BeautifulSoup(html_content, "html.parser")
-                text_parts = [
-                    tag.get_text(strip=True)
-                    for tag in soup.find_all(["p", "b"])
-                    if tag.get_text(strip=True)
-                ]
-                person_data["name"] = ", ".join(text_parts).replace("\n", " ").strip()
+    ) from e
+
+# Index of the fields of a parsed node, kept as small lists in document order:
+# [depth within its branch, ID, TEXT attribute, rich-content HTML or None].
+_DEPTH, _ID, _TEXT, _HTML = range(4)
+
+
+def html_to_name(html_content: str) -> str:
+    """Joins the text of the <p> and <b> tags of a rich-content node."""
+    soup = BeautifulSoup(html_content, "html.parser")
+    text_parts = [
+        tag.get_text(strip=True)
+        for tag in soup.find_all(["p", "b"])
+        if tag.get_text(strip=True)
+    ]
+    return ", ".join(text_parts).replace("\n", " ").strip()
+
+
+def html_to_names(html_contents: list[str]) -> list[str]:
+    """Batch form of `html_to_name`, run in pool workers for one branch."""
+    return [html_to_name(html_content) for html_content in html_contents]
+
+
+def _clean_name(name: str) -> str:
+    """Strips the numbering ("12. ") some nodes start with."""
+    return name.lstrip("0123456789. ").strip() if name else name
+
+
+def _plain_name(node: list) -> str:
+    return node[_TEXT].replace("&#10;", "\n").strip()
+
+
+def iter_branches(source):
+    """
+    Yields the top-level branches of a mind map, one at a time.
+
+    A branch is a child of one of the map's root nodes; roots with a
+    LOCALIZED_TEXT (Freeplane's built-in placeholder nodes) are skipped. Each
+    branch is a list of node lists (see `_DEPTH` etc.) in document order.
+
+    Args:
+        source: Path or binary file object of the .mm file.
+
+    Raises:
+        ValueError: If the map has no family tree root node.
+        xml.etree.ElementTree.ParseError: If the file is not well-formed XML.
+    """
+    elements = []  # Currently open elements, outermost first.
+    branch: list[list] = []
+    # The branch's currently open nodes, innermost last, as
+    # (element, node, whether its first richcontent was already read).
+    open_nodes: list[list] = []
+    roots_found = 0
+    skipping = None  # The placeholder root being skipped, if any.
+
+    for event, elem in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            parent = elements[-1] if elements else None
+            elements.append(elem)
+            if elem.tag != "node" or skipping is not None:
+                continue
+            if len(elements) == 2:  # A root node directly below <map>.
+                if "LOCALIZED_TEXT" in elem.attrib:
+                    skipping = elem
+                else:
+                    roots_found += 1
+            elif (open_nodes and parent is open_nodes[-1][0]) or (
+                len(elements) == 3 and parent.tag == "node"
+            ):
+                node = [len(open_nodes), elem.get("ID"), elem.get("TEXT", ""), None]
+                branch.append(node)
+                open_nodes.append([elem, node, False])
+            continue
+
+        elements.pop()
+        if skipping is not None:
+            if elem is skipping:
+                skipping = None
+                elements[-1].remove(elem)
+            continue
+        if not open_nodes:
+            if len(elements) == 1 and elem.tag == "node":
+                elements[-1].remove(elem)  # A finished root.
+            continue
+
+        innermost = open_nodes[-1]
+        if elem.tag == "richcontent" and elements[-1] is innermost[0]:
+            # Only a node's first richcontent counts, even if it is empty.
+            if not innermost[2]:
+                innermost[2] = True
+                innermost[1][_HTML] = elem.text
+        elif elem is innermost[0]:
+            open_nodes.pop()
+            if not open_nodes:
+                # The branch is complete; drop its elements and hand it on.
+                elements[-1].remove(elem)
+                yield branch
+                branch = []
+
+    if not roots_found:
+        raise ValueError("Could not find any main family tree root nodes in the XML.")
+
+
+def _iter_file_branches(input_path: pathlib.Path) -> Iterator[list[list]]:
+    with open(input_path, "rb") as fp:
+        yield from iter_branches(fp)
+
+
+def resolve_names(branch: list[list], html_names: list[str]) -> list[str]:
+    """Returns the cleaned name of every node of a branch."""
+    names = []
+    html_names = iter(html_names)
+    for node in branch:
+        name = next(html_names) if node[_HTML] else _plain_name(node)
+        names.append(_clean_name(name))
+    return names
+
+
+class JsonTreeWriter:
+    """
+    Writes branches as the JSON array `json.dump(nodes, indent=2)` would
+    produce, one branch at a time and without recursion.
+    """
+
+    def __init__(self, fp):
+        self.fp = fp
+        self.started = False
+
+    def write_branch(self, branch: list[list], names: list[str]) -> None:
+        write = self.fp.write
+        if self.started:
+            write(",\n")
+        else:
+            write("[\n")
+            self.started = True
+
+        open_depths = []  # Depths of nodes whose "children" list is open.
+        first_in_list = True
+        for i, node in enumerate(branch):
+            depth = node[_DEPTH]
+            while open_depths and open_depths[-1] >= depth:
+                self._close_branch(open_depths.pop())
+            if not first_in_list:
+                write(",\n")
+            first_in_list = False
+
+            indent = " " * (2 + 4 * depth)
+            write(
+                f"{indent}{{\n"
+                f'{indent}  "id": {json.dumps(node[_ID], ensure_ascii=False)},\n'
+                f'{indent}  "name": {json.dumps(names[i], ensure_ascii=False)},\n'
+            )
+            has_children = i + 1 < len(branch) and branch[i + 1][_DEPTH] > depth
+            if has_children:
+                write(f'{indent}  "children": [\n')
+                open_depths.append(depth)
+                first_in_list = True
             else:
-                person_data["name"] = (
-                    elem.get("TEXT", "").replace("&#10;", "\n").strip()
+                write(
+                    f'{indent}  "children": [],\n{indent}  "type": "leaf"\n{indent}}}'
                 )
-        else:
-            person_data["name"] = elem.get("TEXT", "").replace("&#10;", "\n").strip()
+        while open_depths:
+            self._close_branch(open_depths.pop())
 
-        if person_data.get("name"):
-            person_data["name"] = person_data["name"].lstrip("0123456789. ").strip()
+    def _close_branch(self, depth: int) -> None:
+        indent = " " * (2 + 4 * depth)
+        self.fp.write(f'\n{indent}  ],\n{indent}  "type": "branch"\n{indent}}}')
+
+    def close(self) -> None:
+        self.fp.write("\n]" if self.started else "[]")
 
-        children = xmlToDict(elem, debug)
-        if children:
-            person_data["children"] = children
-            person_data["type"] = "branch"
-        else:
-            person_data["children"] = []
-            person_data["type"] = "leaf"
 
-        output.append(person_data)
+def iter_named_branches(
+    input_path: pathlib.Path, workers: int
+) -> Iterator[tuple[list[list], list[str]]]:
+    """
+    Yields `(branch, names)` for every top-level branch, in document order,
+    extracting rich-content names in `workers` processes (in-process if
+    `workers` <= 1) while later branches are parsed.
+    """
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    # Branches parsed but not yet handed on; bounded to keep memory flat.
+    pending: deque[tuple[list[list], Future | list[str]]] = deque()
+    max_pending = 2 * workers
+
+    def ready(block: bool) -> Iterator[tuple[list[list], list[str]]]:
+        while pending:
+            branch, html_names = pending[0]
+            if isinstance(html_names, Future):
+                if not block and not html_names.done():
+                    return
+                html_names = html_names.result()
+            pending.popleft()
+            yield branch, resolve_names(branch, html_names)
+
+    try:
+        for branch in _iter_file_branches(input_path):
+            html_contents = [node[_HTML] for node in branch if node[_HTML]]
+            if pool is not None and html_contents:
+                pending.append((branch, pool.submit(html_to_names, html_contents)))
+            else:
+                pending.append((branch, html_to_names(html_contents)))
+            yield from ready(block=len(pending) >= max_pending)
+        yield from ready(block=True)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
 
-    return output
+
+def iter_tree_nodes(
+    input_path: pathlib.Path, workers: int = 1, with_names: bool = True
+) -> Iterator[tuple[str | None, str | None, str | None]]:
+    """
+    Yields `(node_id, parent_id, name)` for every node of a mind map in
+    document order, as the JSON output would list them; `parent_id` is None
+    for top-level branches.
+
+    Without `with_names` the rich content is not parsed and names are None,
+    which makes walking the structure alone much faster.
+    """
+    if with_names:
+        named_branches = iter_named_branches(input_path, workers)
+    else:
+        named_branches = ((branch, None) for branch in _iter_file_branches(input_path))
+
+    ancestors: list[str | None] = []
+    for branch, names in named_branches:
+        for i, node in enumerate(branch):
+            del ancestors[node[_DEPTH] :]
+            parent_id = ancestors[-1] if ancestors else None
+            yield node[_ID], parent_id, names[i] if names is not None else None
+            ancestors.append(node[_ID])
+
+
+def convert(input_path: pathlib.Path, output_path: pathlib.Path, workers: int) -> int:
+    """
+    Converts a mind map to JSON, extracting rich-content names in `workers`
+    processes (in-process if `workers` <= 1).
+
+    Returns:
+        The number of top-level branches written.
+    """
+    count = 0
+    try:
+        with open(output_path, "w", encoding="utf-8") as out:
+            writer = JsonTreeWriter(out)
+            for branch, names in iter_named_branches(input_path, workers):
+                writer.write_branch(branch, names)
+                count += 1
+            writer.close()
+    except BaseException:
+        output_path.unlink(missing_ok=True)  # Don't leave a truncated file.
+        raise
+    return count
 
 
 def main():
@@ -60,6 +289,12 @@ def main():
         "--output",
         help="Output JSON file path. Defaults to input filename with .json extension.",
     )
+    ap.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Processes used to extract names from rich content (1 = no pool).",
+    )
     ap.add_argument("--debug", action="store_true", help="Enable debug output.")
     args = ap.parse_args()
 
@@ -69,41 +304,24 @@ def main():
         print(f"Error: File not found at {file_path}")
         exit(1)
 
-    raw_xml = ""
-    try:
-        with open(file_path, encoding="utf-8") as fp:
-            raw_xml = fp.read()
-    except Exception as e:
-        print(f"File IO Error: {e}")
-        exit(1)
-
-    root_element = ET.fromstring(raw_xml)
-
-    mind_map_roots = []
-    for node in root_element.findall("node"):
-        if "LOCALIZED_TEXT" not in node.attrib:
-            mind_map_roots.append(node)
-
-    if not mind_map_roots:
-        print("Error: Could not find any main family tree root nodes in the XML.")
-        exit(1)
-
-    mind_map_json = []
-    for root_node in mind_map_roots:
-        parsed_node = xmlToDict(root_node, args.debug)
-        if parsed_node:
-            mind_map_json.extend(parsed_node)
-
     output_file_path = (
         pathlib.Path(args.output) if args.output else file_path.with_suffix(".json")
     )
     try:
-        with open(output_file_path, "w", encoding="utf-8") as f:
-            json.dump(mind_map_json, f, ensure_ascii=False, indent=2)
-        print(f"Successfully parsed '{file_path}' to '{output_file_path}'")
-    except Exception as e:
-        print(f"Error writing JSON output: {e}")
+        count = convert(file_path, output_file_path, args.workers)
+    except ValueError as e:
+        print(f"Error: {e}")
+        exit(1)
+    except ET.ParseError as e:
+        print(f"XML parse error: {e}")
         exit(1)
+    except OSError as e:
+        print(f"File IO Error: {e}")
+        exit(1)
+
+    if args.debug:
+        print(f"Wrote {count} top-level branches")
+    print(f"Successfully parsed '{file_path}' to '{output_file_path}'")
 
 
 if __name__ == "__main__":
@@ -3,7 +3,11 @@ import logging
 import os
 
 from app.services.birthday_service import get_todays_birthdays_for_notification
-from app.services.notification_service import format_birthday_email, send_email
+from app.services.email_queue import EmailDeliveryQueue
+from app.services.notification_service import (
+    build_unsubscribe_url,
+    format_birthday_email,
+)
 from app.utils.database import (
     AsyncSessionFactory,
     async_engine,
@@ -41,6 +45,8 @@ async def run_notifications():
     birthdays_found = 0
     emails_sent_successfully = 0
     total_recipients = 0
+    recipients_delivered = 0
+    recipients_failed = 0
 
     try:
         async with AsyncSessionFactory() as session:
@@ -57,33 +63,64 @@ async def run_notifications():
 
                 logger.info(f"Found {birthdays_found} birthday(s) today.")
 
-                for info in birthday_infos:
-                    if not info.subscriber_emails:
-                        logger.warning(
-                            f"No subscribers found for {info.name}'s birthday notification. Skipping."
-                        )
-                        continue
-
-                    logger.info(
-                        f"Processing birthday for {info.name} (Age: {info.age}). Subscribers: {len(info.subscriber_emails)}"
-                    )
-                    total_recipients += len(info.subscriber_emails)
-
-                    subject, body = format_birthday_email(info.name, info.age)
+                # Every subscriber gets a message of their own, with their own
+                # unsubscribe link and without the other addresses. Deliveries
+                # run concurrently in the background over a few persistent
+                # SMTP sessions, so the event loop stays free while mail drains.
+                unsubscribe_urls = {}
+                async with EmailDeliveryQueue(app_config) as mail_queue:
+                    deliveries = []
+                    for info in birthday_infos:
+                        if not info.subscriber_emails:
+                            logger.warning(
+                                f"No subscribers found for {info.name}'s birthday notification. Skipping."
+                            )
+                            continue
 
-                    success = send_email(
-                        subject, body, info.subscriber_emails, app_config
-                    )
-
-                    if success:
                         logger.info(
-                            f"Successfully sent birthday notification for {info.name} to {len(info.subscriber_emails)} recipients."
-                        )
-                        emails_sent_successfully += 1
-                    else:
-                        logger.error(
-                            f"Failed to send birthday notification for {info.name}."
+                            f"Processing birthday for {info.name} (Age: {info.age}). Subscribers: {len(info.subscriber_emails)}"
                         )
+                        total_recipients += len(info.subscriber_emails)
+
+                        recipient_deliveries = []
+                        for email in info.subscriber_emails:
+                            if email not in unsubscribe_urls:
+                                unsubscribe_urls[email] = build_unsubscribe_url(
+                                    email, app_config
+                                )
+                            subject, body = format_birthday_email(
+                                info.name, info.age, unsubscribe_urls[email]
+                            )
+                            recipient_deliveries.append(
+                                mail_queue.submit(
+                                    subject,
+                                    body,
+                                    [email],
+                                    label=f"birthday of {info.name} to {email}",
+                                    unsubscribe_url=unsubscribe_urls[email],
+                                )
+                            )
+                        deliveries.append((info, recipient_deliveries))
+
+                    for info, recipient_deliveries in deliveries:
+                        results = await asyncio.gather(*recipient_deliveries)
+                        failed = [
+                            result.recipients[0]
+                            for result in results
+                            if not result.delivered
+                        ]
+                        delivered = len(results) - len(failed)
+                        recipients_delivered += delivered
+                        recipients_failed += len(failed)
+                        if not failed:
+                            logger.info(
+                                f"Successfully sent birthday notification for {info.name} to {delivered} recipients."
+                            )
+                            emails_sent_successfully += 1
+                        else:
+                            logger.error(
+                                f"Failed to send birthday notification for {info.name} to {len(failed)} of {len(results)} recipients: {failed}"
+                            )
 
             except Exception:
                 logger.exception(
@@ -95,16 +132,27 @@ async def run_notifications():
 
     except Exception:
         logger.exception("Failed to acquire database session.", exc_info=True)
-    finally:
-        if async_engine:
-            await async_engine.dispose()
-            logger.info("Database engine disposed.")
 
     logger.info("Birthday notification script finished.")
     logger.info(
-        f"Summary: Found={birthdays_found}, Notifications Attempted={emails_sent_successfully}, Total Recipients Targeted={total_recipients}"
+        f"Summary: Found={birthdays_found}, Notifications Attempted={emails_sent_successfully}, Total Recipients Targeted={total_recipients}, Delivered={recipients_delivered}, Failed={recipients_failed}"
     )
 
 
+async def main():
+    """
+    Runs the notifications as a standalone script.
+
+    The engine is disposed only here: in the scheduler, run_notifications runs
+    alongside other jobs that share the engine, which the scheduler owns.
+    """
+    try:
+        await run_notifications()
+    finally:
+        if async_engine:
+            await async_engine.dispose()
+            logger.info("Database engine disposed.")
+
+
 if __name__ == "__main__":
-    asyncio.run(run_notifications())
+    asyncio.run(main())